@@ -1,4 +1,5 @@
 from wqb.logging_config import setup_logging
+from wqb.serializers import serializer_profile
 from kombu import Exchange, Queue
 import os
 
@@ -62,6 +63,15 @@ task_routes = {
     }
 }
 
+# 序列化与压缩 - 由 WQB_SERIALIZER / WQB_COMPRESSION 选择，生产者与 worker 使用同一套配置
+_serialization = serializer_profile()
+task_serializer = _serialization['task_serializer']
+result_serializer = _serialization['result_serializer']
+accept_content = _serialization['accept_content']
+result_accept_content = _serialization['result_accept_content']
+task_compression = _serialization['task_compression']
+result_compression = _serialization['result_compression']
+
 # 其余配置
 task_acks_late = True
 task_acks_on_failure_or_timeout = True
@@ -72,7 +82,12 @@ task_annotations = {
     'wqb.tasks.simulate_task': {
         'soft_time_limit': None,
         'time_limit': 6000,
-    }
+    },
+    # 批量任务在一个进程内同时跑多个模拟，整体耗时随批量大小增长
+    'wqb.tasks.simulate_batch_task': {
+        'soft_time_limit': None,
+        'time_limit': int(os.environ.get('WQB_BATCH_TIME_LIMIT', 36000)),
+    },
 }
 
 worker_max_tasks_per_child = 2000
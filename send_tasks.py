@@ -1,6 +1,7 @@
 # send_tasks.py
 import os
 from celery import Celery
+from wqb.serializers import serializer_profile
 
 # --- Configuration --- #
 # Explicitly get the broker URL from environment variables.
@@ -11,6 +12,9 @@ if not BROKER_URL:
 # Create a Celery app instance configured with the broker URL.
 app = Celery('wqb', broker=BROKER_URL)
 
+# Use the same serializer and compression as the workers (WQB_SERIALIZER, WQB_COMPRESSION).
+app.conf.update(serializer_profile())
+
 # --- Task Definition --- #
 
 # The name of the task to be called
@@ -53,23 +53,47 @@ class Null:
 NULL = Null()
 
 
+from . import adaptive_limiter
+from . import alpha_columns
+from . import alpha_index
 from . import auto_auth_session
+from . import blob_store
 from . import datetime_range
 from . import filter_range
+from . import multi_alpha_packer
+from . import response_cache
+from . import simulation_cache
+from . import simulation_poller
 from . import wqb_session
 from . import wqb_urls
 
 __all__ = (
-    auto_auth_session.__all__
+    adaptive_limiter.__all__
+    + alpha_columns.__all__
+    + alpha_index.__all__
+    + auto_auth_session.__all__
+    + blob_store.__all__
     + datetime_range.__all__
     + filter_range.__all__
+    + multi_alpha_packer.__all__
+    + response_cache.__all__
+    + simulation_cache.__all__
+    + simulation_poller.__all__
     + wqb_session.__all__
     + wqb_urls.__all__
 )
 
 
+from .adaptive_limiter import *
+from .alpha_columns import *
+from .alpha_index import *
 from .auto_auth_session import *
+from .blob_store import *
 from .datetime_range import *
 from .filter_range import *
+from .multi_alpha_packer import *
+from .response_cache import *
+from .simulation_cache import *
+from .simulation_poller import *
 from .wqb_session import *
 from .wqb_urls import *
@@ -0,0 +1,153 @@
+import asyncio
+import collections
+import time
+from typing import Self
+
+__all__ = ['AdaptiveLimiter']
+
+
+class AdaptiveLimiter:
+    """
+    An AIMD concurrency limiter, usable wherever an `asyncio.Semaphore`
+    is accepted as `concurrency`.
+
+    The permitted number of holders grows additively with every
+    `on_success` (by about `increase` per full window) and is cut by the
+    factor `decrease` on `on_throttle`, at most once per `cooldown`
+    seconds, so a burst of rejections from one window counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 5.0,
+    ) -> None:
+        """
+        Initializes an `AdaptiveLimiter` object.
+
+        Parameters
+        ----------
+        initial: int = 4
+            The initial limit.
+        min_limit: int = 1
+            The lower bound of the limit.
+        max_limit: int = 100
+            The upper bound of the limit.
+        increase: float = 1.0
+            The additive increase per window of successes.
+        decrease: float = 0.5
+            The multiplicative factor applied on a throttle.
+        cooldown: float = 5.0
+            The minimum number of seconds between two decreases.
+
+        Returns
+        -------
+        None
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.increase = increase
+        self.decrease = min(max(decrease, 0.0), 1.0)
+        self.cooldown = cooldown
+        self.successes = 0
+        self.throttles = 0
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters = collections.deque()
+        self._last_decrease = float('-inf')
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<AdaptiveLimiter [{self.in_flight}/{self.limit}]>"
+
+    @property
+    def limit(
+        self,
+    ) -> int:
+        """
+        The current number of permitted holders.
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(
+        self,
+    ) -> int:
+        """
+        The current number of holders.
+        """
+        return self._in_flight
+
+    async def acquire(
+        self,
+    ) -> None:
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(
+        self,
+    ) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def on_success(
+        self,
+    ) -> None:
+        """
+        Records an accepted submission and grows the limit.
+        """
+        self.successes += 1
+        self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+        self._wake()
+
+    def on_throttle(
+        self,
+        *_,
+    ) -> None:
+        """
+        Records a rejected submission and shrinks the limit.
+        """
+        self.throttles += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * self.decrease)
+
+    def _wake(
+        self,
+    ) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def __aenter__(
+        self,
+    ) -> Self:
+        await self.acquire()
+        return self
+
+    async def __aexit__(
+        self,
+        *exc_info,
+    ) -> None:
+        self.release()
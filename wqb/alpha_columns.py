@@ -0,0 +1,306 @@
+import datetime
+import os
+from array import array
+from collections.abc import Iterable
+from typing import Any
+from .alpha_index import _lookup
+
+__all__ = ['ALPHA_FIELDS', 'AlphaColumns']
+
+# record path -> kind, one column per path
+ALPHA_FIELDS = {
+    'id': 'string',
+    'name': 'string',
+    'type': 'category',
+    'status': 'category',
+    'category': 'category',
+    'color': 'category',
+    'favorite': 'bool',
+    'hidden': 'bool',
+    'dateCreated': 'datetime',
+    'dateModified': 'datetime',
+    'dateSubmitted': 'datetime',
+    'settings.instrumentType': 'category',
+    'settings.region': 'category',
+    'settings.universe': 'category',
+    'settings.delay': 'number',
+    'settings.decay': 'number',
+    'settings.neutralization': 'category',
+    'settings.truncation': 'number',
+    'settings.pasteurization': 'category',
+    'settings.unitHandling': 'category',
+    'settings.nanHandling': 'category',
+    'settings.language': 'category',
+    'is.pnl': 'number',
+    'is.bookSize': 'number',
+    'is.longCount': 'number',
+    'is.shortCount': 'number',
+    'is.turnover': 'number',
+    'is.returns': 'number',
+    'is.drawdown': 'number',
+    'is.margin': 'number',
+    'is.sharpe': 'number',
+    'is.fitness': 'number',
+    'is.selfCorrelation': 'number',
+    'is.prodCorrelation': 'number',
+    'os.startDate': 'datetime',
+    'os.sharpe60': 'number',
+    'os.sharpe125': 'number',
+    'os.sharpe250': 'number',
+    'os.sharpe500': 'number',
+    'os.osISSharpeRatio': 'number',
+    'os.preCloseSharpe': 'number',
+    'os.preCloseSharpeRatio': 'number',
+}
+_KINDS = ('string', 'category', 'bool', 'number', 'datetime')
+# int64 minimum, `numpy.datetime64('NaT')`
+_NAT = -(1 << 63)
+
+
+def _epoch_ms(
+    val: str | None,
+) -> int:
+    if val is None:
+        return _NAT
+    dt = datetime.datetime.fromisoformat(val)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return round(dt.timestamp() * 1000)
+
+
+class AlphaColumns:
+    """
+    A columnar table of alpha records.
+
+    Records are appended straight into typed buffers, one per field:
+    *number* fields as float64 (*NaN* if missing), *datetime* fields as
+    UTC milliseconds, *bool* fields as int8 (*-1* if missing), and
+    *category* fields as int32 codes into `categories` (*-1* if missing).
+    `to_numpy` and `to_arrow` then build arrays without per-record work.
+    """
+
+    def __init__(
+        self,
+        fields: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        fields: dict[str, str] | None = None
+            The record paths to keep, each mapped to one of *'string'*,
+            *'category'*, *'bool'*, *'number'* and *'datetime'*. If
+            *None*, `ALPHA_FIELDS` is used.
+        """
+        self.fields = dict(ALPHA_FIELDS if fields is None else fields)
+        for path, kind in self.fields.items():
+            if kind not in _KINDS:
+                raise ValueError(f"unknown kind '{kind}' of field '{path}'")
+        self.categories: dict[str, list[str]] = {}
+        self._codes: dict[str, dict[str, int]] = {}
+        self._buffers: dict[str, list[str | None] | array] = {}
+        for path, kind in self.fields.items():
+            if 'string' == kind:
+                self._buffers[path] = []
+            elif 'category' == kind:
+                self.categories[path] = []
+                self._codes[path] = {}
+                self._buffers[path] = array('i')
+            elif 'bool' == kind:
+                self._buffers[path] = array('b')
+            elif 'number' == kind:
+                self._buffers[path] = array('d')
+            else:
+                self._buffers[path] = array('q')
+        self._size = 0
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<AlphaColumns [{self._size} rows x {len(self.fields)} columns]>"
+
+    def __len__(
+        self,
+    ) -> int:
+        return self._size
+
+    def append(
+        self,
+        record: dict[str, Any],
+    ) -> None:
+        """
+        Appends one alpha record.
+        """
+        for path, kind in self.fields.items():
+            val = _lookup(record, path)
+            buffer = self._buffers[path]
+            if 'string' == kind:
+                buffer.append(None if val is None else str(val))
+            elif 'category' == kind:
+                if val is None:
+                    buffer.append(-1)
+                    continue
+                val = str(val)
+                codes = self._codes[path]
+                code = codes.get(val)
+                if code is None:
+                    code = codes[val] = len(codes)
+                    self.categories[path].append(val)
+                buffer.append(code)
+            elif 'bool' == kind:
+                buffer.append(-1 if val is None else int(bool(val)))
+            elif 'number' == kind:
+                buffer.append(float('nan') if val is None else float(val))
+            else:
+                buffer.append(_epoch_ms(val))
+        self._size += 1
+
+    def extend(
+        self,
+        records: Iterable[dict[str, Any]],
+    ) -> int:
+        """
+        Appends alpha records.
+
+        Returns
+        -------
+        int
+            The number of records appended.
+        """
+        size = self._size
+        for record in records:
+            self.append(record)
+        return self._size - size
+
+    @classmethod
+    def from_session(
+        cls,
+        wqbs: Any,
+        *args,
+        sharded: bool = False,
+        fields: dict[str, str] | None = None,
+        **kwargs,
+    ) -> 'AlphaColumns':
+        """
+        Streams the alphas of `wqbs` into a new table.
+
+        Parameters
+        ----------
+        wqbs: WQBSession
+            The session to fetch alphas with.
+        sharded: bool = False
+            If *True*, `filter_alphas_sharded` is used to export beyond
+            `OFFSET_CAP`, otherwise `iter_alphas`.
+        fields: dict[str, str] | None = None
+            See `AlphaColumns.__init__`.
+
+        Returns
+        -------
+        AlphaColumns
+            The table.
+
+        Notes
+        -----
+        `args` and `kwargs` are passed to the fetching method.
+        """
+        table = cls(fields)
+        if sharded:
+            table.extend(wqbs.filter_alphas_sharded(*args, **kwargs))
+        else:
+            table.extend(wqbs.iter_alphas(*args, **kwargs))
+        return table
+
+    def to_numpy(
+        self,
+    ) -> dict[str, Any]:
+        """
+        Returns one NumPy array per field.
+
+        *string* fields are object arrays, *category* fields int32 codes
+        into `categories`, *bool* fields int8 with *-1* if missing,
+        *number* fields float64 and *datetime* fields `datetime64[ms]`
+        with *NaT* if missing.
+
+        Returns
+        -------
+        dict[str, numpy.ndarray]
+            The arrays, keyed by record path.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("AlphaColumns.to_numpy requires numpy: pip install 'wqb[numpy]'") from e
+        arrays = {}
+        for path, kind in self.fields.items():
+            buffer = self._buffers[path]
+            if 'string' == kind:
+                arrays[path] = np.array(buffer, dtype=object)
+            elif 'category' == kind:
+                arrays[path] = np.frombuffer(buffer, dtype=np.int32).copy()
+            elif 'bool' == kind:
+                arrays[path] = np.frombuffer(buffer, dtype=np.int8).copy()
+            elif 'number' == kind:
+                arrays[path] = np.frombuffer(buffer, dtype=np.float64).copy()
+            else:
+                arrays[path] = np.frombuffer(buffer, dtype=np.int64).astype('datetime64[ms]')
+        return arrays
+
+    def to_arrow(
+        self,
+    ) -> Any:
+        """
+        Returns the table as a `pyarrow.Table`.
+
+        *category* fields become dictionary arrays, *datetime* fields UTC
+        timestamps, and missing values nulls.
+
+        Returns
+        -------
+        pyarrow.Table
+            The table, with one column per record path.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError as e:
+            raise ImportError("AlphaColumns.to_arrow requires pyarrow: pip install 'wqb[parquet]'") from e
+
+        def from_buffer(type, buffer, missing):
+            arr = pa.Array.from_buffers(type, len(buffer), [None, pa.py_buffer(buffer)])
+            mask = pc.is_nan(arr) if missing is None else pc.equal(arr, missing)
+            return pc.if_else(mask, pa.scalar(None, type), arr)
+
+        columns = {}
+        for path, kind in self.fields.items():
+            buffer = self._buffers[path]
+            if 'string' == kind:
+                columns[path] = pa.array(buffer, type=pa.string())
+            elif 'category' == kind:
+                columns[path] = pa.DictionaryArray.from_arrays(
+                    from_buffer(pa.int32(), buffer, -1),
+                    pa.array(self.categories[path], type=pa.string()),
+                )
+            elif 'bool' == kind:
+                columns[path] = from_buffer(pa.int8(), buffer, -1).cast(pa.bool_())
+            elif 'number' == kind:
+                columns[path] = from_buffer(pa.float64(), buffer, None)
+            else:
+                columns[path] = from_buffer(pa.int64(), buffer, _NAT).cast(
+                    pa.timestamp('ms', tz='UTC')
+                )
+        return pa.table(columns)
+
+    def write_parquet(
+        self,
+        path: str | os.PathLike,
+        **kwargs,
+    ) -> None:
+        """
+        Writes the table to a Parquet file.
+
+        Notes
+        -----
+        `kwargs` are passed to `pyarrow.parquet.write_table`.
+        """
+        table = self.to_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, **kwargs)
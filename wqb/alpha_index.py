@@ -0,0 +1,337 @@
+import datetime
+import json
+import os
+import sqlite3
+from collections.abc import Iterable
+from math import isinf
+from typing import Any
+from .cookie_store import account_key, default_cache_dir
+from .filter_range import FilterRange
+from .local_database import LocalDatabase
+
+__all__ = ['AlphaIndex']
+
+# keyword of `WQBSession.filter_alphas_limited` -> (column, record path, kind)
+COLUMNS = {
+    'name': ('name', 'name', 'text'),
+    'competition': ('competition', 'competitions', 'bool'),
+    'type': ('type', 'type', 'text'),
+    'language': ('settings_language', 'settings.language', 'text'),
+    'date_created': ('date_created', 'dateCreated', 'datetime'),
+    'favorite': ('favorite', 'favorite', 'bool'),
+    'date_submitted': ('date_submitted', 'dateSubmitted', 'datetime'),
+    'start_date': ('os_start_date', 'os.startDate', 'datetime'),
+    'status': ('status', 'status', 'text'),
+    'category': ('category', 'category', 'text'),
+    'color': ('color', 'color', 'text'),
+    'tag': ('tags', 'tags', 'tags'),
+    'hidden': ('hidden', 'hidden', 'bool'),
+    'region': ('settings_region', 'settings.region', 'text'),
+    'instrument_type': ('settings_instrument_type', 'settings.instrumentType', 'text'),
+    'universe': ('settings_universe', 'settings.universe', 'text'),
+    'delay': ('settings_delay', 'settings.delay', 'number'),
+    'decay': ('settings_decay', 'settings.decay', 'number'),
+    'neutralization': ('settings_neutralization', 'settings.neutralization', 'text'),
+    'truncation': ('settings_truncation', 'settings.truncation', 'number'),
+    'unit_handling': ('settings_unit_handling', 'settings.unitHandling', 'text'),
+    'nan_handling': ('settings_nan_handling', 'settings.nanHandling', 'text'),
+    'pasteurization': ('settings_pasteurization', 'settings.pasteurization', 'text'),
+    'sharpe': ('is_sharpe', 'is.sharpe', 'number'),
+    'returns': ('is_returns', 'is.returns', 'number'),
+    'pnl': ('is_pnl', 'is.pnl', 'number'),
+    'turnover': ('is_turnover', 'is.turnover', 'number'),
+    'drawdown': ('is_drawdown', 'is.drawdown', 'number'),
+    'margin': ('is_margin', 'is.margin', 'number'),
+    'fitness': ('is_fitness', 'is.fitness', 'number'),
+    'book_size': ('is_book_size', 'is.bookSize', 'number'),
+    'long_count': ('is_long_count', 'is.longCount', 'number'),
+    'short_count': ('is_short_count', 'is.shortCount', 'number'),
+    'sharpe60': ('os_sharpe60', 'os.sharpe60', 'number'),
+    'sharpe125': ('os_sharpe125', 'os.sharpe125', 'number'),
+    'sharpe250': ('os_sharpe250', 'os.sharpe250', 'number'),
+    'sharpe500': ('os_sharpe500', 'os.sharpe500', 'number'),
+    'os_is_sharpe_ratio': ('os_is_sharpe_ratio', 'os.osISSharpeRatio', 'number'),
+    'pre_close_sharpe': ('os_pre_close_sharpe', 'os.preCloseSharpe', 'number'),
+    'pre_close_sharpe_ratio': ('os_pre_close_sharpe_ratio', 'os.preCloseSharpeRatio', 'number'),
+    'self_correlation': ('is_self_correlation', 'is.selfCorrelation', 'number'),
+    'prod_correlation': ('is_prod_correlation', 'is.prodCorrelation', 'number'),
+}
+_SQL_TYPES = {'text': 'TEXT', 'bool': 'INTEGER', 'datetime': 'REAL', 'number': 'REAL', 'tags': 'TEXT'}
+_ORDER_COLUMNS = {path: column for column, path, _ in COLUMNS.values()}
+_ORDER_COLUMNS['dateModified'] = 'date_modified'
+
+
+def _lookup(
+    record: dict[str, Any],
+    path: str,
+) -> Any:
+    for key in path.split('.'):
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def _timestamp(
+    val: datetime.datetime | str | None,
+) -> float | None:
+    if val is None:
+        return None
+    if isinstance(val, str):
+        val = datetime.datetime.fromisoformat(val)
+    if val.tzinfo is None:
+        val = val.replace(tzinfo=datetime.timezone.utc)
+    return val.timestamp()
+
+
+def _column_value(
+    val: Any,
+    kind: str,
+) -> Any:
+    if val is None:
+        return None
+    if 'bool' == kind:
+        return 1 if val else 0
+    if 'datetime' == kind:
+        return _timestamp(val)
+    if 'tags' == kind:
+        return json.dumps(list(val))
+    return val
+
+
+class AlphaIndex(LocalDatabase):
+    """
+    A local SQLite index of the account's alphas.
+
+    `sync` pulls only the alphas modified since the last sync, and
+    `query` answers the keyword filters of
+    `WQBSession.filter_alphas_limited` from indexed columns, without
+    touching the platform.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+    ) -> None:
+        if path is None:
+            # the alphas and the watermark belong to one account
+            path = default_cache_dir() / f"alphas-{account_key()}.sqlite3"
+        super().__init__(path)
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<AlphaIndex [{self.path}]>"
+
+    def _create(
+        self,
+        conn: sqlite3.Connection,
+    ) -> None:
+        columns = ', '.join(
+            f"{column} {_SQL_TYPES[kind]}" for column, _, kind in COLUMNS.values()
+        )
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS alphas (id TEXT PRIMARY KEY, "
+            f"date_modified REAL, {columns}, record TEXT NOT NULL)"
+        )
+        for column, _, kind in COLUMNS.values():
+            if 'tags' != kind:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS alphas_{column} ON alphas ({column})"
+                )
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+    @property
+    def watermark(
+        self,
+    ) -> str | None:
+        """
+        The latest `dateModified` synced, as returned by the platform.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM meta WHERE key = 'watermark'"
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def upsert(
+        self,
+        records: Iterable[dict[str, Any]],
+        *,
+        batch_size: int = 500,
+        ceiling: datetime.datetime | None = None,
+    ) -> int:
+        """
+        Inserts or replaces alpha records and advances the watermark.
+
+        The watermark is saved once `records` is exhausted, so an
+        interrupted upsert leaves it where it was and the next sync
+        fetches the same range again. If `ceiling` is given, the
+        watermark does not move past it.
+
+        Returns
+        -------
+        int
+            The number of records written.
+        """
+        names = ['id', 'date_modified'] + [column for column, _, _ in COLUMNS.values()] + ['record']
+        sql = f"INSERT OR REPLACE INTO alphas ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        total = 0
+        watermark = self.watermark
+        latest = _timestamp(watermark)
+        batch = []
+
+        def flush() -> None:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany(sql, batch)
+                conn.commit()
+            batch.clear()
+
+        for record in records:
+            modified = record.get('dateModified') or record.get('dateCreated')
+            if modified is not None and (latest is None or latest < _timestamp(modified)):
+                watermark, latest = modified, _timestamp(modified)
+            batch.append(
+                (record['id'], _timestamp(modified))
+                + tuple(
+                    _column_value(_lookup(record, path), kind)
+                    for _, path, kind in COLUMNS.values()
+                )
+                + (json.dumps(record, ensure_ascii=False),)
+            )
+            total += 1
+            if batch_size <= len(batch):
+                flush()
+        flush()
+        if ceiling is not None and latest is not None and ceiling.timestamp() < latest:
+            watermark = ceiling.isoformat()
+        if watermark is not None:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('watermark', ?)", (watermark,))
+                conn.commit()
+        return total
+
+    def sync(
+        self,
+        session: Any,
+        *,
+        concurrency: int = 4,
+        log: str | None = '',
+    ) -> int:
+        """
+        Pulls the alphas created or modified since the watermark from
+        `session`, or all alphas on the first sync.
+
+        Both are exported by `filter_alphas_sharded`, so neither is
+        limited by `OFFSET_CAP`. The watermark never passes the start of
+        the sync, so alphas modified while it runs are fetched again by
+        the next one.
+
+        Parameters
+        ----------
+        session: WQBSession
+            The session to fetch alphas with.
+        concurrency: int = 4
+            The number of threads fetching pages.
+        log: str | None = ''
+            The message to be appended. If *None*, logging is disabled.
+
+        Returns
+        -------
+        int
+            The number of records written.
+        """
+        started = datetime.datetime.now(datetime.timezone.utc)
+        watermark = self.watermark
+        others = None if watermark is None else [f"dateModified>={watermark}"]
+        records = session.filter_alphas_sharded(
+            others=others, concurrency=concurrency, log=log
+        )
+        return self.upsert(records, ceiling=started)
+
+    def _where(
+        self,
+        filters: dict[str, Any],
+    ) -> tuple[str, list[Any]]:
+        clauses = []
+        params = []
+        for keyword, value in filters.items():
+            if value is None:
+                continue
+            if keyword not in COLUMNS:
+                raise TypeError(f"AlphaIndex does not support the filter '{keyword}'")
+            column, _, kind = COLUMNS[keyword]
+            if isinstance(value, FilterRange):
+                for bound, eq, op in ((value.lo, value.lo_eq, '>'), (value.hi, value.hi_eq, '<')):
+                    if isinstance(bound, float) and isinf(bound):
+                        continue
+                    clauses.append(f"{column} {op}{'=' if eq else ''} ?")
+                    params.append(_column_value(bound, kind))
+            elif 'tags' == kind:
+                clauses.append(f"EXISTS (SELECT 1 FROM json_each({column}) WHERE value = ?)")
+                params.append(value)
+            elif 'name' == keyword:
+                if '=' == value[:1]:
+                    clauses.append(f"{column} = ?")
+                    params.append(value[1:])
+                else:
+                    clauses.append(f"{column} LIKE ?")
+                    params.append(f"%{value.removeprefix('~')}%")
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(_column_value(value, kind))
+        return ' AND '.join(clauses) or '1', params
+
+    def query(
+        self,
+        *,
+        order: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        **filters,
+    ) -> list[dict[str, Any]]:
+        """
+        Returns the indexed alpha records matching `filters`, the
+        keyword filters of `WQBSession.filter_alphas_limited`.
+
+        Parameters
+        ----------
+        order: str | None = None
+            A platform order such as *'-is.sharpe'* or *'dateCreated'*.
+        limit: int | None = None
+            The maximum number of records. If *None*, there is no limit.
+        offset: int = 0
+            The number of records to skip.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The alpha records.
+        """
+        where, params = self._where(filters)
+        sql = f"SELECT record FROM alphas WHERE {where}"
+        if order is not None:
+            column = _ORDER_COLUMNS.get(order.lstrip('-'))
+            if column is None:
+                raise ValueError(f"AlphaIndex cannot order by '{order}'")
+            sql += f" ORDER BY {column} {'DESC' if order.startswith('-') else 'ASC'}"
+        sql += ' LIMIT ? OFFSET ?'
+        params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(
+        self,
+        **filters,
+    ) -> int:
+        """
+        Returns the number of indexed alphas matching `filters`.
+        """
+        where, params = self._where(filters)
+        with self._lock:
+            return self._connect().execute(
+                f"SELECT COUNT(*) FROM alphas WHERE {where}", params
+            ).fetchone()[0]
@@ -1,12 +1,24 @@
+import asyncio
+import functools
 import logging
+import threading
 import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 from requests import Response, Session
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from . import RETRY_AFTER
+from .rate_limiter import SharedRateLimiter
 from .session import ApiClient
+from .transport import DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT, configure_session
 
 __all__ = ['AutoAuthSession']
 logger = logging.getLogger(__name__)
 
+# Failures without a response that are retried like a 5xx response
+TRANSPORT_ERRORS = (RequestsConnectionError, Timeout)
+
 class AutoAuthSession(Session):
 
     def __init__(
@@ -16,17 +28,33 @@ class AutoAuthSession(Session):
         expected: Callable[[Response], bool] = lambda _: True,
         max_tries: int = 3,
         delay_unexpected: float = 2.0,
+        max_workers: int = 32,
+        pool_maxsize: int | None = None,
+        timeout: float | tuple[float, float] | None = DEFAULT_TIMEOUT,
+        rate_limiter: SharedRateLimiter | None = None,
         logger: logging.Logger = logger,
         **kwargs,
     ) -> None:
         super().__init__()
+        if pool_maxsize is None:
+            pool_maxsize = max(max_workers, DEFAULT_POOL_MAXSIZE)
+        configure_session(self, pool_maxsize=pool_maxsize)
         self.api_client = api_client
         self.expected = expected
         self.max_tries = max(1, max_tries)
         self.delay_unexpected = max(0.0, delay_unexpected)
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
         self.logger = logger
         self.kwargs = kwargs
         self.auth_inited = False
+        self.auth_generation = 0
+        self._auth_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._refresher = None
+        self._refresher_stop = threading.Event()
 
     def __repr__(
         self,
@@ -41,17 +69,60 @@ class AutoAuthSession(Session):
         """
         return f"<AutoAuthSession []>"
 
+    @property
+    def executor(
+        self,
+    ) -> ThreadPoolExecutor:
+        """
+        The thread pool that carries the blocking HTTP round trips of
+        `arequest`, created on first use.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='wqb-http',
+                )
+            return self._executor
+
+    def close(
+        self,
+    ) -> None:
+        """
+        Stops the auto refresh, shuts down the `executor` and closes all
+        adapters.
+        """
+        self.stop_auto_refresh()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        super().close()
+
     def auth_request(
         self,
         log: str | None = None,
+        generation: int | None = None,
     ) -> Response:
         """
         Logs in using the ApiClient and updates the session headers.
+
+        Concurrent calls are coalesced: one login runs at a time and
+        `auth_generation` is bumped after each. A caller passing the
+        `generation` it observed before its failed request returns
+        immediately if a newer cookie has arrived in the meantime.
         """
-        if log is not None:
-            self.logger.info(f"start login from auto_auth_session: self.api_client.cookie")
-        new_session = self.api_client.login(force_update=False)
-        self.headers.update(new_session.headers)
+        with self._auth_lock:
+            if generation is not None and generation != self.auth_generation:
+                if log is not None:
+                    self.logger.info(f"{self}.auth_request(...) [skipped, generation {generation} -> {self.auth_generation}]: {log}")
+                return None
+            if log is not None:
+                self.logger.info(f"start login from auto_auth_session: self.api_client.cookie")
+            new_session = self.api_client.login(force_update=False)
+            self.headers.update(new_session.headers)
+            self.auth_inited = True
+            self.auth_generation += 1
         if log is not None:
             self.logger.info(f"{self}.auth_request(...): {log}")
         # Since this method no longer returns a Response, we can return None
@@ -59,6 +130,157 @@ class AutoAuthSession(Session):
         # request method to handle this.
         return None
 
+    def refresh_auth(
+        self,
+        max_age: float,
+        log: str | None = None,
+    ) -> bool:
+        """
+        Refreshes the cookie if it is older than `max_age` seconds and
+        updates the session headers, without dropping the session or its
+        connection pool.
+
+        Returns
+        -------
+        bool
+            Whether the cookie changed.
+        """
+        with self._auth_lock:
+            changed = self.api_client.refresh(max_age)
+            if changed:
+                self.headers.update({'Cookie': self.api_client.cookie})
+                self.auth_inited = True
+                self.auth_generation += 1
+        if log is not None:
+            self.logger.info(f"{self}.refresh_auth(...) [changed={changed}]: {log}")
+        return changed
+
+    def start_auto_refresh(
+        self,
+        max_age: float = 3600 * 3,
+        interval: float = 60.0,
+    ) -> None:
+        """
+        Starts a daemon thread that checks the cookie age every
+        `interval` seconds and refreshes it ahead of `max_age`, so that
+        live requests do not run into an expired cookie.
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+
+        def run() -> None:
+            while not self._refresher_stop.wait(interval):
+                if self.api_client.cookie_age < max_age:
+                    continue
+                try:
+                    self.refresh_auth(max_age, log='auto refresh')
+                except Exception:
+                    self.logger.warning(f"{self}.start_auto_refresh(...): refresh failed", exc_info=True)
+
+        self._refresher = threading.Thread(
+            target=run, name='wqb-auth-refresh', daemon=True
+        )
+        self._refresher.start()
+
+    def stop_auto_refresh(
+        self,
+    ) -> None:
+        """
+        Stops the thread started by `start_auto_refresh`.
+        """
+        self._refresher_stop.set()
+        self._refresher = None
+
+    @staticmethod
+    def _is_simulation_limit(
+        resp: Response,
+    ) -> bool:
+        try:
+            response_json = resp.json()
+            if isinstance(response_json, dict):
+                if 'SIMULATION_LIMIT_EXCEEDED' in response_json.get('detail', ''):
+                    return True
+        except ValueError:
+            pass # Not a JSON response
+        return False
+
+    def _observe_rate_limit(
+        self,
+        url: str,
+        resp: Response,
+    ) -> None:
+        if self.rate_limiter is None or 429 != resp.status_code:
+            return
+        try:
+            retry_after = float(resp.headers[RETRY_AFTER])
+        except (KeyError, ValueError):
+            retry_after = self.delay_unexpected
+        self.rate_limiter.penalize(url, retry_after)
+
+    def _recovery(
+        self,
+        resp: Response,
+        tries: int,
+        delay_unexpected: float,
+    ) -> tuple[float, bool] | None:
+        """
+        Decides how to recover from an unexpected response.
+
+        Returns
+        -------
+        tuple[float, bool] | None
+            The delay before the next try and whether to re-authenticate
+            after it, or *None* if the request must not be retried.
+        """
+        self.logger.warning(f"{self}.request(...) [{tries} tries]: {resp.status_code} {resp.reason} {resp.text} {resp.elapsed} {resp.headers}")
+
+        # Special exception for 400 Bad Request: abort immediately.
+        if resp.status_code == 400:
+            self.logger.error(f"Received 400 Bad Request. This is a non-retryable client error. Aborting.")
+            return None
+
+        # For all other errors, use the original retry/re-login logic.
+        is_simulation_limit = self._is_simulation_limit(resp)
+
+        if resp.status_code == 504:
+            self.logger.warning(f"Received 504 Gateway Timeout. Retrying in {delay_unexpected} seconds...")
+            return delay_unexpected, False
+        if is_simulation_limit: # This is a specific type of 429 error
+            self.logger.warning(f"Simulation limit exceeded. Retrying in {10 * delay_unexpected} seconds...")
+            return 10 * delay_unexpected, False
+        self.logger.warning("Attempting to recover from error by re-authenticating.")
+        return delay_unexpected, True # Re-authenticate for other errors (e.g., 401, 403, 5xx)
+
+    def _log_tries_ran_out(
+        self,
+        tries: int,
+        method: str,
+        url: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        resp: Response,
+    ) -> None:
+        self.logger.warning(
+            '\n'.join(
+                (
+                    f"{self}.request(...) [max {tries} tries ran out]",
+                    f"super().request(method, url, *args, **kwargs):",
+                    f"    method: {method}",
+                    f"    url: {url}",
+                    f"    args: {args}",
+                    f"    kwargs: {kwargs}",
+                    f"{resp}:",
+                    f"    status_code: {resp.status_code}",
+                    f"    reason: {resp.reason}",
+                    f"    url: {resp.url}",
+                    f"    elapsed: {resp.elapsed}",
+                    f"    headers: {resp.headers}",
+                    f"    text: {resp.text}",
+                )
+            )
+        )
+
     def request(
         self,
         method: str,
@@ -78,67 +300,142 @@ class AutoAuthSession(Session):
             delay_unexpected = self.delay_unexpected
         max_tries = max(1, max_tries)
         delay_unexpected = max(0.0, delay_unexpected)
+        kwargs.setdefault('timeout', self.timeout)
         if not self.auth_inited:
-            self.auth_inited = True
-            self.auth_request()
+            self.auth_request(generation=0)
 
         for tries in range(1, 1 + max_tries):
-            resp = super().request(method, url, *args, **kwargs)
+            if self.rate_limiter is not None:
+                time.sleep(self.rate_limiter.reserve(url))
+            generation = self.auth_generation
+            try:
+                resp = super().request(method, url, *args, **kwargs)
+            except TRANSPORT_ERRORS as e:
+                if max_tries <= tries:
+                    raise
+                self.logger.warning(f"{self}.request(...) [{tries} tries]: {repr(e)}. Retrying in {delay_unexpected} seconds...")
+                time.sleep(delay_unexpected)
+                continue
+            self._observe_rate_limit(url, resp)
             if expected(resp):
                 break # Success, exit the loop
+            recovery = self._recovery(resp, tries, delay_unexpected)
+            if recovery is None:
+                break
+            delay, reauth = recovery
+            time.sleep(delay)
+            if reauth:
+                self.auth_request(generation=generation)
+        else: # This block now only runs if the loop completes without a `break`
+            self._log_tries_ran_out(tries, method, url, args, kwargs, resp)
+        if log is not None:
+            self.logger.info(f"{self}.request(...) [{tries} tries]: {log}")
+        return resp
 
-            self.logger.warning(f"{self}.request(...) [{tries} tries]: {resp.status_code} {resp.reason} {resp.text} {resp.elapsed} {resp.headers}")
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        *args,
+        expected: Callable[[Response], bool] | None = None,
+        max_tries: int | None = None,
+        delay_unexpected: float | None = None,
+        on_throttle: Callable[[Response], None] | None = None,
+        log: str | None = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Awaitable counterpart of `request`.
 
-            # --- Start of the final, focused error handling logic ---
+        Each round trip runs on `executor`, so the event loop stays free
+        and up to `max_workers` requests are in flight at the same time.
+        Backoff delays are awaited with `asyncio.sleep`, so a throttled
+        request never holds up other coroutines. Authentication, retries
+        and `expected` behave as in `request`. A timeout or connection
+        error is retried after `delay_unexpected` like a 504, and raised
+        once the tries run out.
 
-            # Special exception for 400 Bad Request: abort immediately.
-            if resp.status_code == 400:
-                self.logger.error(f"Received 400 Bad Request. This is a non-retryable client error. Aborting.")
-                break
+        Parameters
+        ----------
+        method: str
+            The HTTP method.
+        url: str
+            The URL.
+        expected: Callable[[Response], bool] | None = None
+            Whether a response is accepted. If *None*, `self.expected`
+            is used.
+        max_tries: int | None = None
+            The maximum number of tries. If *None*, `self.max_tries` is
+            used.
+        delay_unexpected: float | None = None
+            The base delay in seconds after an unexpected response. If
+            *None*, `self.delay_unexpected` is used.
+        on_throttle: Callable[[Response], None] | None = None
+            Called with every unexpected response that is a 429 or a
+            SIMULATION_LIMIT_EXCEEDED rejection.
+        log: str | None = None
+            The message to be appended. If *None*, logging is disabled.
 
-            # For all other errors, use the original retry/re-login logic.
-            is_simulation_limit = False
-            try:
-                response_json = resp.json()
-                if isinstance(response_json, dict):
-                    if 'SIMULATION_LIMIT_EXCEEDED' in response_json.get('detail', ''):
-                        is_simulation_limit = True
-            except ValueError:
-                pass # Not a JSON response
-
-            if resp.status_code == 504:
-                self.logger.warning(f"Received 504 Gateway Timeout. Retrying in {delay_unexpected} seconds...")
-                time.sleep(delay_unexpected)
-            elif is_simulation_limit: # This is a specific type of 429 error
-                self.logger.warning(f"Simulation limit exceeded. Retrying in {10 * delay_unexpected} seconds...")
-                time.sleep(10 * delay_unexpected)
-            else:
-                self.logger.warning("Attempting to recover from error by re-authenticating.")
-                time.sleep(delay_unexpected)
-                self.auth_request() # Re-authenticate for other errors (e.g., 401, 403, 5xx)
+        Returns
+        -------
+        Response
+            A `Response` object.
 
-            # --- End of the final logic ---
+        Notes
+        -----
+        `args` and `kwargs` are passed to `Session.request`.
+        """
+        if expected is None:
+            expected = self.expected
+        if max_tries is None:
+            max_tries = self.max_tries
+        if delay_unexpected is None:
+            delay_unexpected = self.delay_unexpected
+        max_tries = max(1, max_tries)
+        delay_unexpected = max(0.0, delay_unexpected)
+        kwargs.setdefault('timeout', self.timeout)
+        loop = asyncio.get_running_loop()
+        if not self.auth_inited:
+            await loop.run_in_executor(
+                self.executor, functools.partial(self.auth_request, generation=0)
+            )
 
-        else: # This block now only runs if the loop completes without a `break`
-            self.logger.warning(
-                '\n'.join(
-                    (
-                        f"{self}.request(...) [max {tries} tries ran out]",
-                        f"super().request(method, url, *args, **kwargs):",
-                        f"    method: {method}",
-                        f"    url: {url}",
-                        f"    args: {args}",
-                        f"    kwargs: {kwargs}",
-                        f"{resp}:",
-                        f"    status_code: {resp.status_code}",
-                        f"    reason: {resp.reason}",
-                        f"    url: {resp.url}",
-                        f"    elapsed: {resp.elapsed}",
-                        f"    headers: {resp.headers}",
-                        f"    text: {resp.text}",
+        send = functools.partial(super().request, method, url, *args, **kwargs)
+        for tries in range(1, 1 + max_tries):
+            if self.rate_limiter is not None:
+                await asyncio.sleep(
+                    await loop.run_in_executor(
+                        self.executor, self.rate_limiter.reserve, url
                     )
                 )
-            )
+            generation = self.auth_generation
+            try:
+                resp = await loop.run_in_executor(self.executor, send)
+            except TRANSPORT_ERRORS as e:
+                if max_tries <= tries:
+                    raise
+                self.logger.warning(f"{self}.arequest(...) [{tries} tries]: {repr(e)}. Retrying in {delay_unexpected} seconds...")
+                await asyncio.sleep(delay_unexpected)
+                continue
+            self._observe_rate_limit(url, resp)
+            if expected(resp):
+                break # Success, exit the loop
+            if on_throttle is not None and (
+                429 == resp.status_code or self._is_simulation_limit(resp)
+            ):
+                on_throttle(resp)
+            recovery = self._recovery(resp, tries, delay_unexpected)
+            if recovery is None:
+                break
+            delay, reauth = recovery
+            await asyncio.sleep(delay)
+            if reauth:
+                await loop.run_in_executor(
+                    self.executor,
+                    functools.partial(self.auth_request, generation=generation),
+                )
+        else: # This block now only runs if the loop completes without a `break`
+            self._log_tries_ran_out(tries, method, url, args, kwargs, resp)
         if log is not None:
-            self.logger.info(f"{self}.request(...) [{tries} tries]: {log}")
+            self.logger.info(f"{self}.arequest(...) [{tries} tries]: {log}")
         return resp
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any
+from .cookie_store import default_cache_dir
+
+__all__ = ['BlobStore']
+
+
+class BlobStore:
+    """
+    A content-addressed store of JSON payloads on the local disk.
+
+    Each payload is kept zlib-compressed in a file named by the sha256
+    of its canonical JSON, so storing the same payload twice costs
+    nothing and a reference never goes stale.
+
+    Attributes:
+        directory (Path): The directory holding the blobs.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike | None = None,
+        *,
+        level: int = 6,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir() / 'blobs'
+        self.level = level
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<BlobStore [{self.directory}]>"
+
+    def _path(
+        self,
+        ref: str,
+    ) -> Path:
+        digest = ref.removeprefix('sha256:')
+        if 64 != len(digest) or not all(c in '0123456789abcdef' for c in digest):
+            raise ValueError(f"invalid blob reference <{ref=}>")
+        return self.directory / digest[:2] / f"{digest}.json.z"
+
+    def put(
+        self,
+        payload: Any,
+    ) -> str:
+        """
+        Stores `payload` and returns its reference, *'sha256:<hex>'*.
+        """
+        data = json.dumps(
+            payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str
+        ).encode()
+        ref = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        path = self._path(ref)
+        if path.exists():
+            return ref
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(data, self.level))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return ref
+
+    def get(
+        self,
+        ref: str,
+    ) -> Any:
+        """
+        Returns the payload of `ref`, or raises `KeyError` if no blob is
+        stored under it.
+        """
+        try:
+            with open(self._path(ref), 'rb') as f:
+                return json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            raise KeyError(ref) from None
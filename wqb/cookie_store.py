@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from .file_lock import FileLock
+
+__all__ = ['CookieStore']
+
+
+def default_cache_dir() -> Path:
+    """
+    The directory for host-wide caches, `WQB_CACHE_DIR` or `<tmp>/wqb`.
+    """
+    return Path(os.getenv('WQB_CACHE_DIR') or Path(tempfile.gettempdir()) / 'wqb')
+
+
+def account_key() -> str:
+    """
+    The hash of `API_KEY` and `WQB_API_BASE_URL`, naming the host-wide
+    caches of an account.
+    """
+    return hashlib.sha256(
+        f"{os.getenv('API_KEY')}\0{os.getenv('WQB_API_BASE_URL')}".encode()
+    ).hexdigest()[:32]
+
+
+class CookieStore:
+    """
+    A cookie cache shared by all processes on the host.
+
+    The entry lives in a JSON file keyed by the API domain and API key.
+    `lock` serialises refreshes, so that only one process talks to the
+    login service at a time and the others pick up its cookie.
+
+    Attributes:
+        path (Path): The JSON file holding the cookie.
+        lock (FileLock): The lock guarding refreshes of `path`.
+    """
+
+    def __init__(
+        self,
+        domain: str | None,
+        api_key: str | None,
+        directory: str | os.PathLike | None = None,
+    ) -> None:
+        directory = Path(directory) if directory is not None else default_cache_dir()
+        key = hashlib.sha256(f"{domain}\0{api_key}".encode()).hexdigest()[:32]
+        self.path = directory / f"cookie-{key}.json"
+        self.lock = FileLock(directory / f"cookie-{key}.lock")
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<CookieStore [{self.path}]>"
+
+    def read(
+        self,
+    ) -> tuple[str | None, float | None]:
+        """
+        Returns the stored cookie and the time it was stored, or
+        `(None, None)` if there is no usable entry.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry['cookie'], float(entry['updated_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, None
+
+    def write(
+        self,
+        cookie: str,
+    ) -> float:
+        """
+        Atomically replaces the stored cookie and returns its timestamp.
+        """
+        updated_at = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'cookie': cookie, 'updated_at': updated_at}, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return updated_at
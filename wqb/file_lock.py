@@ -0,0 +1,71 @@
+import os
+import threading
+from pathlib import Path
+from typing import Self
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows.
+    fcntl = None
+
+__all__ = ['FileLock']
+
+
+class FileLock:
+    """
+    An exclusive advisory lock backed by a file, shared by every thread
+    and process on the host that opens the same path.
+
+    On platforms without `fcntl` the lock only excludes threads of the
+    current process.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+    ) -> None:
+        self.path = Path(path)
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<FileLock [{self.path}]>"
+
+    def acquire(
+        self,
+    ) -> None:
+        self._thread_lock.acquire()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+
+    def release(
+        self,
+    ) -> None:
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(
+        self,
+    ) -> Self:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        *exc_info,
+    ) -> None:
+        self.release()
@@ -1,8 +1,15 @@
 import os
 import json
+import time
+import atexit
 import logging
-import asyncio
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from celery import states
 from celery.backends.base import BaseBackend
+from celery.signals import worker_process_init, worker_process_shutdown
 from lark_oapi.api.bitable.v1 import (
     AppTableRecord,
     BatchCreateAppTableRecordRequest,
@@ -12,14 +19,418 @@ from lark_oapi.api.bitable.v1 import (
 
 import lark_oapi as lark
 
-# Import WQB session and URL
-from wqb.tasks import get_wqb_session
-from wqb.wqb_urls import URL_SIMULATIONS
+from wqb.cookie_store import default_cache_dir
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Bitable accepts at most 500 records per batch_create call
+LARK_BATCH_LIMIT = 500
+
+# Longer text fields are truncated, keeping Bitable cells and upload batches small
+LARK_FIELD_MAX_CHARS = int(os.environ.get("LARK_FIELD_MAX_CHARS", 20000))
+
+# Bitable errors caused by the records themselves; replaying the same batch cannot succeed
+LARK_REJECTED_CODES = frozenset({
+    1254000,  # WrongRequestJson
+    1254001,  # WrongRequestBody
+    1254045,  # FieldNameNotFound
+    *range(1254060, 1254075),  # a field value failed to convert to its column type
+    1254104,  # RecordAddOnceExceedLimit
+})
+
+class LarkRejectedError(Exception):
+    """Raised by an upload when Lark rejects the records themselves rather than failing."""
+
+def _truncate(text):
+    if not LARK_FIELD_MAX_CHARS or len(text) <= LARK_FIELD_MAX_CHARS:
+        return text
+    return f"{text[:LARK_FIELD_MAX_CHARS]}... [truncated {len(text) - LARK_FIELD_MAX_CHARS} chars]"
+
+class LarkSpool:
+    """
+    A durable local spool of Lark records waiting for upload, shared by all worker
+    processes on the host through SQLite.
+
+    Every record is appended here before it is uploaded, so results survive Lark
+    outages and worker restarts. Uploaders claim the oldest records as a batch with
+    its own client token; a batch stays claimed for `lease` seconds, after which any
+    process may claim it again with the same token, so a replayed batch is
+    deduplicated by Lark. A batch is deleted once Lark accepted it. A batch given
+    up after a failure is held back for a delay and counts an attempt, and records
+    Lark will never accept are moved to the `dead_letters` table.
+    """
+    def __init__(self, path=None, lease=300.0):
+        self.path = Path(path) if path else default_cache_dir() / 'lark-spool.sqlite3'
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._conn = None
+        self._process_id = None
+
+    def _connect(self):
+        # Called with self._lock held; connections are never shared across fork
+        if self._conn is None or self._process_id != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS records ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, fields TEXT NOT NULL, created_at REAL NOT NULL, '
+                'batch TEXT, claimed_at REAL)'
+            )
+            if 'attempts' not in [row[1] for row in conn.execute('PRAGMA table_info(records)')]:
+                conn.execute('ALTER TABLE records ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0')
+            conn.execute('CREATE INDEX IF NOT EXISTS records_batch ON records (batch)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS dead_letters ('
+                'id INTEGER PRIMARY KEY, fields TEXT NOT NULL, created_at REAL NOT NULL, '
+                'failed_at REAL NOT NULL, reason TEXT)'
+            )
+            self._conn = conn
+            self._process_id = os.getpid()
+        return self._conn
+
+    def append(self, records):
+        """Durably appends records (dicts of Bitable fields)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    'INSERT INTO records (fields, created_at) VALUES (?, ?)',
+                    [(json.dumps(fields, ensure_ascii=False), now) for fields in records],
+                )
+
+    def pending(self):
+        """Returns the number of claimable records and the creation time of the oldest."""
+        expired = time.time() - self.lease
+        with self._lock:
+            return self._connect().execute(
+                'SELECT COUNT(*), MIN(created_at) FROM records WHERE batch IS NULL OR claimed_at < ?',
+                (expired,),
+            ).fetchone()
+
+    def claim(self, limit):
+        """Claims a batch of at most `limit` records and returns its token and records, or None."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # The oldest claimable record decides: an abandoned or released batch is
+                # replayed with its original token, otherwise a new batch is started
+                row = conn.execute(
+                    'SELECT batch FROM records WHERE batch IS NULL OR claimed_at < ? ORDER BY id LIMIT 1',
+                    (now - self.lease,),
+                ).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return None
+                if row[0] is not None:
+                    token = row[0]
+                    conn.execute('UPDATE records SET claimed_at = ? WHERE batch = ?', (now, token))
+                else:
+                    ids = [id for id, in conn.execute(
+                        'SELECT id FROM records WHERE batch IS NULL ORDER BY id LIMIT ?', (limit,)
+                    )]
+                    token = str(uuid.uuid4())
+                    conn.executemany(
+                        'UPDATE records SET batch = ?, claimed_at = ? WHERE id = ?',
+                        [(token, now, id) for id in ids],
+                    )
+                records = [json.loads(fields) for fields, in conn.execute(
+                    'SELECT fields FROM records WHERE batch = ? ORDER BY id', (token,)
+                )]
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return token, records
+
+    def renew(self, token):
+        """Extends the lease of a claimed batch."""
+        with self._lock:
+            self._connect().execute('UPDATE records SET claimed_at = ? WHERE batch = ?', (time.time(), token))
+
+    def attempts(self, token):
+        """Returns the number of times a batch was given up."""
+        with self._lock:
+            row = self._connect().execute('SELECT MAX(attempts) FROM records WHERE batch = ?', (token,)).fetchone()
+        return row[0] or 0
+
+    def release(self, token, delay=0.0):
+        """
+        Gives a claimed batch up and counts an attempt; any process may replay it with
+        the same token after `delay` seconds, and newer batches are claimed meanwhile.
+        """
+        with self._lock:
+            self._connect().execute(
+                'UPDATE records SET claimed_at = ?, attempts = attempts + 1 WHERE batch = ?',
+                (time.time() + delay - self.lease, token),
+            )
+
+    def split(self, token):
+        """Splits a rejected batch in two new batches, claimable at once, and returns their tokens."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                ids = [id for id, in conn.execute('SELECT id FROM records WHERE batch = ? ORDER BY id', (token,))]
+                # Fresh tokens, as Lark may answer a reused one with the cached rejection
+                halves = ids[:len(ids) // 2], ids[len(ids) // 2:]
+                tokens = [str(uuid.uuid4()) for _ in halves]
+                conn.executemany(
+                    'UPDATE records SET batch = ?, claimed_at = 0 WHERE id = ?',
+                    [(half_token, id) for half_token, half in zip(tokens, halves) for id in half],
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return tokens
+
+    def dead_letter(self, token, reason):
+        """Moves a batch Lark will never accept to the `dead_letters` table."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO dead_letters SELECT id, fields, created_at, ?, ? FROM records WHERE batch = ?',
+                    (now, reason, token),
+                )
+                conn.execute('DELETE FROM records WHERE batch = ?', (token,))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    def ack(self, token):
+        """Deletes a batch accepted by Lark."""
+        with self._lock:
+            self._connect().execute('DELETE FROM records WHERE batch = ?', (token,))
+
+class LarkBatchWriter:
+    """
+    Drains a `LarkSpool` to Lark from a background thread.
+
+    A batch is uploaded once `batch_size` records are waiting or `interval` seconds
+    after the oldest of them was spooled, whichever comes first. A failed upload is
+    retried with exponential backoff; a batch that still fails is released back to
+    the spool and replayed after a growing delay, and dead-lettered once it was given
+    up `max_attempts` times. A batch Lark rejects is split until the rejected records
+    are isolated, and those are dead-lettered at once. The thread is started on first use in each process,
+    so a writer created before the worker forks still works in its children, and it
+    also replays records left in the spool by earlier or crashed processes.
+    """
+    def __init__(self, upload, spool, batch_size=LARK_BATCH_LIMIT, interval=5.0, max_tries=5, backoff=1.0, max_backoff=60.0,
+                 max_attempts=10, max_release_delay=3600.0):
+        self.upload = upload
+        self.spool = spool
+        self.batch_size = max(1, min(batch_size, LARK_BATCH_LIMIT))
+        self.interval = interval
+        self.max_tries = max(1, max_tries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max(1, max_attempts)
+        self.max_release_delay = max_release_delay
+        self._retry_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._process_id = None
+
+    def start(self):
+        """Starts the background thread of this process, if it is not running."""
+        with self._cond:
+            if self._thread is None or self._process_id != os.getpid():
+                self._retry_at = 0.0
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name='lark-batch-writer', daemon=True)
+                self._thread.start()
+                self._process_id = os.getpid()
+
+    def put(self, records):
+        """Spools records for upload and returns immediately."""
+        if not records:
+            return
+        self.spool.append(records)
+        self.start()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _wait_for_batch(self):
+        # Returns False once the writer is closed and nothing more can be uploaded
+        with self._cond:
+            while True:
+                count, oldest = self.spool.pending()
+                now = time.time()
+                if self._closed:
+                    return bool(count)
+                if count and self._retry_at <= now:
+                    if self.batch_size <= count or oldest + self.interval <= now:
+                        return True
+                    timeout = oldest + self.interval - now
+                else:
+                    timeout = max(self.interval, self._retry_at - now)
+                self._cond.wait(timeout)
+
+    def _run(self):
+        while self._wait_for_batch():
+            claimed = self.spool.claim(self.batch_size)
+            if claimed is not None and not self._upload_with_retry(*claimed):
+                if self._closed:
+                    # Lark is unavailable; the rest stays in the spool for the next start
+                    return
+                self._retry_at = time.time() + self.max_backoff
+
+    def _upload_with_retry(self, token, records):
+        for tries in range(1, self.max_tries + 1):
+            try:
+                if self.upload(records, token):
+                    self.spool.ack(token)
+                    return True
+            except LarkRejectedError as e:
+                self._reject(token, records, e)
+                return True
+            except Exception:
+                logger.warning(f"Uploading {len(records)} records to Lark raised (try {tries}/{self.max_tries}).", exc_info=True)
+            if tries < self.max_tries:
+                time.sleep(min(self.max_backoff, self.backoff * 2 ** (tries - 1)))
+                self.spool.renew(token)
+        attempts = self.spool.attempts(token) + 1
+        if self.max_attempts <= attempts:
+            logger.error(f"Uploading {len(records)} records to Lark failed in {attempts} attempts; they are dead-lettered in {self.spool.path}.")
+            self.spool.dead_letter(token, f"gave up after {attempts} attempts")
+        else:
+            delay = min(self.max_release_delay, self.max_backoff * 2 ** (attempts - 1))
+            logger.error(f"Uploading {len(records)} records to Lark failed {self.max_tries} times; they stay spooled in {self.spool.path} and are replayed in {delay} seconds.")
+            self.spool.release(token, delay)
+        return False
+
+    def _reject(self, token, records, error):
+        if 1 < len(records):
+            # Bisect, so the accepted records still go through
+            logger.warning(f"Lark rejected a batch of {len(records)} records ({error}); splitting it.")
+            self.spool.split(token)
+        else:
+            logger.error(f"Lark rejected a record ({error}); it is dead-lettered in {self.spool.path}.")
+            self.spool.dead_letter(token, str(error))
+
+    def close(self, timeout=None):
+        """Uploads the spooled records and stops the thread; what fails stays spooled."""
+        with self._cond:
+            if self._thread is None or self._process_id != os.getpid():
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+class ResultIndex:
+    """
+    A local index of task results keyed by task_id, shared by all processes on the
+    host through SQLite. It is written alongside the Lark records and answers the
+    state and result lookups of producers without touching Lark.
+    """
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_cache_dir() / 'lark-results.sqlite3'
+        self._lock = threading.Lock()
+        self._conn = None
+        self._process_id = None
+
+    def _connect(self):
+        # Called with self._lock held; connections are never shared across fork
+        if self._conn is None or self._process_id != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'task_id TEXT PRIMARY KEY, status TEXT NOT NULL, meta BLOB NOT NULL, stored_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)')
+            self._conn = conn
+            self._process_id = os.getpid()
+        return self._conn
+
+    def put(self, task_id, status, meta):
+        """Stores the encoded meta of a task."""
+        with self._lock:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                (task_id, status, meta, time.time()),
+            )
+
+    def get(self, task_id):
+        """Returns the encoded meta of a task, or None if it is unknown."""
+        with self._lock:
+            row = self._connect().execute('SELECT meta FROM results WHERE task_id = ?', (task_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def get_many(self, task_ids, statuses):
+        """Returns the encoded metas of the tasks in one of `statuses`, keyed by task_id."""
+        task_ids = list(task_ids)
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            # Stay below the SQLite limit on bound parameters
+            for i in range(0, len(task_ids), 500):
+                chunk = task_ids[i:i + 500]
+                found.update(conn.execute(
+                    f"SELECT task_id, meta FROM results WHERE task_id IN ({', '.join('?' * len(chunk))}) "
+                    f"AND status IN ({', '.join('?' * len(statuses))})",
+                    [*chunk, *statuses],
+                ))
+        return found
+
+    def delete(self, task_id):
+        with self._lock:
+            self._connect().execute('DELETE FROM results WHERE task_id = ?', (task_id,))
+
+    def expire(self, max_age):
+        """Deletes the results stored more than `max_age` seconds ago."""
+        with self._lock:
+            self._connect().execute('DELETE FROM results WHERE stored_at < ?', (time.time() - max_age,))
+
+# app.backend is thread-local, so every backend of a process shares one writer
+_writer = None
+_writer_lock = threading.Lock()
+
+def _shared_writer(upload):
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = LarkBatchWriter(
+                upload,
+                LarkSpool(os.environ.get("LARK_SPOOL_PATH")),
+                batch_size=int(os.environ.get("LARK_BATCH_SIZE", LARK_BATCH_LIMIT)),
+                interval=float(os.environ.get("LARK_FLUSH_INTERVAL", 5)),
+                max_tries=int(os.environ.get("LARK_MAX_TRIES", 5)),
+                max_attempts=int(os.environ.get("LARK_MAX_ATTEMPTS", 10)),
+            )
+        return _writer
+
+# Replay spooled records from the start, and upload what is still spooled on exit
+@worker_process_init.connect
+def _start_writer(**kwargs):
+    if _writer is not None:
+        _writer.start()
+
+@worker_process_shutdown.connect
+def _close_writer(**kwargs):
+    if _writer is not None:
+        _writer.close()
+
+atexit.register(_close_writer)
+
 class LarkBackend(BaseBackend):
+    # get_many answers a whole ResultSet from the local index
+    supports_native_join = True
+
     def __init__(self, app, **kwargs):
         super().__init__(app, **kwargs)
         self.app_token = os.environ.get("LARK_APP_TOKEN")
@@ -39,6 +450,25 @@ class LarkBackend(BaseBackend):
                 .build()
             )
 
+        self.index = ResultIndex(os.environ.get("LARK_RESULT_INDEX_PATH"))
+
+        # Every backend is configured from the same environment, so any one may upload
+        self.writer = _shared_writer(self._batch_create) if self.lark_client else None
+
+    def _batch_create(self, records, client_token):
+        # The client token makes a replayed batch idempotent on the Lark side
+        request_body = BatchCreateAppTableRecordRequestBody.builder().records(
+            [AppTableRecord.builder().fields(fields).build() for fields in records]
+        ).build()
+        request = BatchCreateAppTableRecordRequest.builder().app_token(self.app_token).table_id(self.table_id).client_token(client_token).request_body(request_body).build()
+        response: BatchCreateAppTableRecordResponse = self.lark_client.bitable.v1.app_table_record.batch_create(request)
+        if not response.success():
+            self._log_lark_error(response, "batch_create_records")
+            if response.code in LARK_REJECTED_CODES:
+                raise LarkRejectedError(f"Code: {response.code}, Msg: {response.msg}")
+            return False
+        return True
+
     def _log_lark_error(self, response, operation):
         error_message = (
             f"Lark API operation '{operation}' failed. "
@@ -53,24 +483,14 @@ class LarkBackend(BaseBackend):
             "task_id": task_id,
             "state": item_state,
             "success": str(item_success),
-            "input": json.dumps(item_input, ensure_ascii=False, default=str),
-            "response_json": json.dumps(response_data, ensure_ascii=False, default=str),
-            "traceback": str(traceback) if traceback else "",
-            "error": str(error) if error else "",
-            "exception": str(exception) if exception else "",
+            "input": _truncate(json.dumps(item_input, ensure_ascii=False, default=str)),
+            "response_json": _truncate(json.dumps(response_data, ensure_ascii=False, default=str)),
+            "traceback": _truncate(str(traceback)) if traceback else "",
+            "error": _truncate(str(error)) if error else "",
+            "exception": _truncate(str(exception)) if exception else "",
         }
 
-    async def _get_child_simulation_status(self, session, child_id):
-        url = f"{URL_SIMULATIONS}/{child_id}"
-        try:
-            resp = await session.retry('GET', url, max_tries=5, delay_key_error=1.0)
-            if resp and resp.ok:
-                return resp.json() # Return the full response
-        except Exception as e:
-            logger.error(f"Error fetching simulation status for {child_id}: {e}")
-        return None # Return None on failure
-
-    async def _store_result_async(self, task_id, result, state, traceback=None):
+    def _store_result(self, task_id, result, state, traceback=None):
         if not self.lark_client:
             return
 
@@ -84,7 +504,7 @@ class LarkBackend(BaseBackend):
                 traceback=traceback, 
                 exception=str(result)
             )
-            records_to_create = [AppTableRecord.builder().fields(fields).build()]
+            records_to_create = [fields]
         else:
             results_list = result if isinstance(result, list) else [result]
             records_to_create = []
@@ -93,7 +513,7 @@ class LarkBackend(BaseBackend):
                 if not isinstance(res, dict):
                     logger.warning(f"Result item for task {task_id} is of unexpected type: {type(res)}. Storing as error.")
                     fields = self._build_record_fields(task_id, {}, "FAILED", False, {'error': f'Result item is not a dictionary, but {type(res)}'})
-                    records_to_create.append(AppTableRecord.builder().fields(fields).build())
+                    records_to_create.append(fields)
                     continue
 
                 input_data = res.get('input', '')
@@ -114,66 +534,109 @@ class LarkBackend(BaseBackend):
                 if is_array_input:
                     top_level_status = response_json.get("status")
                     items_to_process = input_data
+                    # Child simulations are resolved by the task itself, this backend does no WQB requests
+                    child_results = res.get('children_json') or []
+
+                    if len(child_results) == len(items_to_process):
+                        for item, child_res in zip(items_to_process, child_results):
+                            child_status = child_res.get("status") if child_res else "ERROR"
+                            item_state = "SUCCESS" if child_status in ["COMPLETE", "WARNING"] else "FAILED"
+                            item_success = item_state == "SUCCESS"
 
-                    if top_level_status in ["COMPLETE", "WARNING"]:
+                            fields = self._build_record_fields(task_id, item, item_state, item_success, child_res or {})
+                            records_to_create.append(fields)
+
+                    elif top_level_status in ["COMPLETE", "WARNING"]:
                         for item in items_to_process:
                             fields = self._build_record_fields(task_id, item, "SUCCESS", True, response_json)
-                            records_to_create.append(AppTableRecord.builder().fields(fields).build())
-                    
-                    elif top_level_status and 'children' in response_json:
-                        wqb_session = get_wqb_session(logger)
-                        child_ids = response_json.get("children", [])
-                        if len(child_ids) == len(items_to_process):
-                            child_tasks = [self._get_child_simulation_status(wqb_session, child_id) for child_id in child_ids]
-                            child_results = await asyncio.gather(*child_tasks)
-
-                            for i, item in enumerate(items_to_process):
-                                child_res = child_results[i]
-                                child_status = child_res.get("status") if child_res else "ERROR"
-                                item_state = "SUCCESS" if child_status in ["COMPLETE", "WARNING"] else "FAILED"
-                                item_success = item_state == "SUCCESS"
-                                if child_status == "CANCELLED": item_state = "FAILED"
-
-                                fields = self._build_record_fields(task_id, item, item_state, item_success, child_res or {})
-                                records_to_create.append(AppTableRecord.builder().fields(fields).build())
-                        else: # Fallback for mismatch
-                            for item in items_to_process:
-                                fields = self._build_record_fields(task_id, item, "FAILED", False, response_json, error="Child ID mismatch")
-                                records_to_create.append(AppTableRecord.builder().fields(fields).build())
+                            records_to_create.append(fields)
+
+                    elif top_level_status and 'children' in response_json: # Fallback for mismatch
+                        for item in items_to_process:
+                            fields = self._build_record_fields(task_id, item, "FAILED", False, response_json, error="Child ID mismatch")
+                            records_to_create.append(fields)
                     else: # Fallback for other array failures
                         for item in items_to_process:
                             fields = self._build_record_fields(task_id, item, "FAILED", False, response_json, error=res.get('error'), exception=res.get('exception'), traceback=traceback)
-                            records_to_create.append(AppTableRecord.builder().fields(fields).build())
+                            records_to_create.append(fields)
                 else:
                     fields = self._build_record_fields(task_id, input_data, state, res.get('success', False), response_json, traceback, res.get('error'), res.get('exception'))
-                    records_to_create.append(AppTableRecord.builder().fields(fields).build())
+                    records_to_create.append(fields)
 
-        if records_to_create:
-            # Correctly build the request body using the dedicated builder
-            request_body = BatchCreateAppTableRecordRequestBody.builder().records(records_to_create).build()
-            request = BatchCreateAppTableRecordRequest.builder().app_token(self.app_token).table_id(self.table_id).request_body(request_body).build()
-            response: BatchCreateAppTableRecordResponse = self.lark_client.bitable.v1.app_table_record.batch_create(request)
-            if not response.success():
-                self._log_lark_error(response, "batch_create_records")
+        # Spooled durably, then uploaded in batches across tasks by the background writer
+        self.writer.put(records_to_create)
 
     def store_result(self, task_id, result, state, traceback=None, request=None, **kwargs):
+        # The local index answers get_state / get_result, whether or not Lark is configured
+        try:
+            meta = self._get_result_meta(self.encode_result(result, state), state, traceback, request)
+            meta['task_id'] = task_id
+            self.index.put(task_id, state, self.encode(meta))
+        except Exception:
+            logger.error(f"Failed to store result for task {task_id} in the local result index.", exc_info=True)
+
         if not self.lark_client:
             logger.warning("LarkBackend not configured. Skipping result storage.")
-            return
+            return result
 
         try:
-            asyncio.run(self._store_result_async(task_id, result, state, traceback))
+            self._store_result(task_id, result, state, traceback)
         except Exception as e:
             logger.error(
                 f"Failed to store result for task {task_id} in Lark. This did not affect the task's success state.",
                 exc_info=True
             )
+        return result
+
+    def _get_task_meta_for(self, task_id):
+        meta = self.index.get(task_id)
+        if meta is None:
+            return {'status': states.PENDING, 'result': None}
+        return self.decode_result(meta)
 
     def get_state(self, task_id):
-        return "PENDING" 
+        return self.get_task_meta(task_id)['status']
 
     def get_result(self, task_id):
-        return None
+        return self.get_task_meta(task_id).get('result')
 
     def get_traceback(self, task_id):
-        return None
+        return self.get_task_meta(task_id).get('traceback')
+
+    def get_many(self, task_ids, timeout=None, interval=0.5, no_ack=True,
+                 on_message=None, on_interval=None, max_iterations=None,
+                 READY_STATES=states.READY_STATES):
+        """Yields (task_id, meta) for each task as soon as it is ready."""
+        interval = 0.5 if interval is None else interval
+        ids = set(task_ids)
+        for task_id in list(ids):
+            cached = self._cache.get(task_id)
+            if cached is not None and cached['status'] in READY_STATES:
+                ids.discard(task_id)
+                yield task_id, cached
+        iterations = 0
+        while ids:
+            for task_id, meta in self.index.get_many(ids, list(READY_STATES)).items():
+                meta = self.decode_result(meta)
+                self._cache[task_id] = meta
+                ids.discard(task_id)
+                if on_message is not None:
+                    on_message(meta)
+                yield task_id, meta
+            if not ids:
+                break
+            if timeout and iterations * interval >= timeout:
+                raise TimeoutError(f'Operation timed out ({timeout})')
+            if on_interval:
+                on_interval()
+            time.sleep(interval)
+            iterations += 1
+            if max_iterations and iterations >= max_iterations:
+                break
+
+    def _forget(self, task_id):
+        self.index.delete(task_id)
+
+    def cleanup(self):
+        if self.expires:
+            self.index.expire(self.expires)
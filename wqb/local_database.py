@@ -0,0 +1,45 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+__all__ = ['LocalDatabase']
+
+
+class LocalDatabase:
+    """
+    A SQLite database in WAL mode, shared by all processes on the host.
+
+    The connection is opened on first use in each process, as a SQLite
+    connection must not be used across `fork`. Subclasses create their
+    tables in `_create` and hold `_lock` around `_connect` and the use
+    of the connection.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+    ) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _create(
+        self,
+        conn: sqlite3.Connection,
+    ) -> None:
+        pass
+
+    def _connect(
+        self,
+    ) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._create(conn)
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from requests import Response
+from . import Alpha, MultiAlpha
+from .simulation_cache import SimulationCache
+from .wqb_session import WQBSession
+
+__all__ = ['MultiAlphaPacker']
+
+
+@dataclass(slots=True)
+class _Pack:
+
+    alphas: list[Alpha] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    logs: list[str] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = field(default=None)
+
+
+class MultiAlphaPacker:
+    """
+    Packs single alphas, submitted one by one from many coroutines, into
+    `MultiAlpha` simulations.
+
+    Alphas of type *REGULAR* with identical settings are gathered until
+    `size` of them are waiting or `window` seconds passed since the first
+    one, then simulated together. The child simulations are fetched and
+    each submitter receives the child result of its own alpha, so callers
+    see the same response as from a single simulation. Other alphas are
+    simulated on their own right away.
+    """
+
+    def __init__(
+        self,
+        session: WQBSession,
+        *,
+        size: int = 10,
+        window: float = 2.0,
+        cache: SimulationCache | None = None,
+        logger: logging.Logger | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Initializes a `MultiAlphaPacker` object.
+
+        Parameters
+        ----------
+        session: WQBSession
+            The session that runs the simulations.
+        size: int = 10
+            The maximum number of alphas in a `MultiAlpha`.
+        window: float = 2.0
+            The maximum seconds an alpha waits for others to pack with.
+        cache: SimulationCache | None = None
+            If given, alphas are looked up in it before packing, and
+            their child results are stored in it.
+        logger: logging.Logger | None = None
+            The `logging.Logger` object. If *None*, `session.logger` is
+            used.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        `kwargs` are passed to `WQBSession.simulate`. `cache` is not:
+        every alpha is looked up and stored here only, so a miss is
+        looked up and counted once.
+        """
+        self.session = session
+        self.size = max(1, size)
+        self.window = max(0.0, window)
+        self.cache = cache
+        self.logger = session.logger if logger is None else logger
+        self.kwargs = kwargs
+        self.packs = 0
+        self.packed = 0
+        self._pending: dict[str, _Pack] = {}
+        self._running: set[asyncio.Task] = set()
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<MultiAlphaPacker [{self.size} x {self.window}s, {self.packed} packed]>"
+
+    @staticmethod
+    def compatibility_key(
+        alpha: Alpha | MultiAlpha,
+    ) -> str | None:
+        """
+        Returns the key shared by the alphas that can be packed with
+        `alpha`, or *None* if it cannot be packed.
+        """
+        if not isinstance(alpha, dict) or 'REGULAR' != alpha.get('type', 'REGULAR'):
+            return None
+        return json.dumps(alpha.get('settings'), sort_keys=True, separators=(',', ':'))
+
+    async def simulate(
+        self,
+        alpha: Alpha | MultiAlpha,
+        log: str | None = None,
+    ) -> Response | None:
+        """
+        Simulates `alpha`, packed with other alphas if possible.
+
+        Parameters
+        ----------
+        alpha: Alpha | MultiAlpha
+            The alpha to simulate.
+        log: str | None = None
+            Passed to `WQBSession.simulate`. A pack is logged with the
+            logs of all its alphas joined.
+
+        Returns
+        -------
+        Response | None
+            The simulation result of `alpha` itself, the parent result if
+            the children could not be told apart, or *None* if no
+            simulation was created.
+        """
+        if self.cache is not None:
+            resp = self.cache.lookup(alpha)
+            if resp is not None:
+                return resp
+        key = self.compatibility_key(alpha) if 1 < self.size else None
+        if key is None:
+            resp = await self.session.simulate(alpha, log=log, **self.kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            pack = self._pending.get(key)
+            if pack is None:
+                pack = self._pending[key] = _Pack()
+                pack.timer = loop.call_later(self.window, self._flush, key)
+            future = loop.create_future()
+            pack.alphas.append(alpha)
+            pack.futures.append(future)
+            if log is not None:
+                pack.logs.append(log)
+            if self.size <= len(pack.alphas):
+                self._flush(key)
+            resp = await future
+        if self.cache is not None and resp is not None:
+            self.cache.put(alpha, resp)
+        return resp
+
+    def _flush(
+        self,
+        key: str,
+    ) -> None:
+        pack = self._pending.pop(key, None)
+        if pack is None:
+            return
+        pack.timer.cancel()
+        task = asyncio.ensure_future(self._run(pack))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(
+        self,
+        pack: _Pack,
+    ) -> None:
+        try:
+            resps = await self._simulate_pack(pack.alphas, ', '.join(pack.logs) if pack.logs else None)
+        except BaseException as e:
+            for future in pack.futures:
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+        for future, resp in zip(pack.futures, resps):
+            if not future.done():
+                future.set_result(resp)
+
+    async def _simulate_pack(
+        self,
+        alphas: list[Alpha],
+        log: str | None,
+    ) -> list[Response | None]:
+        if 1 == len(alphas):
+            return [await self.session.simulate(alphas[0], log=log, **self.kwargs)]
+        self.packs += 1
+        self.packed += len(alphas)
+        result = await self.session.simulate(
+            alphas, resolve_children=True, log=log, **self.kwargs
+        )
+        if len(result.children) != len(alphas):
+            self.logger.warning(
+                f"{self}._simulate_pack(...) [{len(alphas)} alphas]: children not resolved"
+            )
+            return [result.parent] * len(alphas)
+        return result.children
+
+    async def close(
+        self,
+    ) -> None:
+        """
+        Simulates the alphas still waiting and waits for all packs.
+        """
+        for key in list(self._pending):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
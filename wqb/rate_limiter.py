@@ -0,0 +1,198 @@
+import json
+import os
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Self
+from urllib.parse import urlsplit
+from .cookie_store import account_key, default_cache_dir
+from .file_lock import FileLock
+
+__all__ = ['SharedRateLimiter']
+
+FAMILIES = (
+    ('/simulations', 'simulations'),
+    ('/alphas', 'alphas'),
+    ('/data-fields', 'data'),
+    ('/data-sets', 'data'),
+    ('/data-categories', 'data'),
+    ('/operators', 'data'),
+)
+DEFAULT_FAMILY = 'default'
+# The lowest rate, so that a rate of 0 still lets a request through now and then
+MIN_RATE = 1e-3
+
+
+def endpoint_family(
+    url: str,
+) -> str:
+    """
+    Returns the endpoint family of `url`, e.g. *'simulations'*.
+    """
+    path = urlsplit(url).path
+    for prefix, family in FAMILIES:
+        if prefix in path:
+            return family
+    return DEFAULT_FAMILY
+
+
+class SharedRateLimiter:
+    """
+    A token-bucket rate limiter whose buckets live in a locked file, so
+    that every process on the host draws from the same budget.
+
+    Each endpoint family has a rate (requests per second) and a burst.
+    A 429 with `Retry-After` blocks the family for every process until
+    the header's deadline and lowers its rate, which then recovers
+    slowly towards the configured value with every granted request.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        limits: Mapping[str, float | tuple[float, float]],
+        *,
+        backoff: float = 0.8,
+        recovery: float = 0.01,
+        floor: float = 0.1,
+    ) -> None:
+        """
+        Initializes a `SharedRateLimiter` object.
+
+        Parameters
+        ----------
+        path: str | os.PathLike
+            The state file shared by all processes.
+        limits: Mapping[str, float | tuple[float, float]]
+            The rate, or the rate and burst, per endpoint family. The
+            *'default'* family covers URLs of families not listed. A
+            rate is at least `MIN_RATE`.
+        backoff: float = 0.8
+            The factor applied to a family's rate on a 429.
+        recovery: float = 0.01
+            The fraction of the configured rate regained per request.
+        floor: float = 0.1
+            The lowest fraction of the configured rate.
+
+        Returns
+        -------
+        None
+        """
+        self.path = Path(path)
+        self.lock = FileLock(self.path.with_suffix('.lock'))
+        self.limits = {}
+        for family, limit in limits.items():
+            rate, burst = limit if isinstance(limit, tuple) else (limit, max(1.0, limit))
+            self.limits[family] = (max(MIN_RATE, float(rate)), float(burst))
+        self.backoff = backoff
+        self.recovery = recovery
+        self.floor = floor
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<SharedRateLimiter [{self.path}]>"
+
+    @classmethod
+    def from_env(
+        cls,
+    ) -> Self | None:
+        """
+        Builds a limiter from `WQB_RATE_LIMITS`, e.g.
+        *'simulations=2,alphas=5,data=5,default=5'*, or returns *None*
+        if it is not set. A value may carry a burst as *'rate:burst'*.
+        The state file is keyed by `API_KEY` and `WQB_API_BASE_URL`.
+        """
+        spec = os.environ.get('WQB_RATE_LIMITS')
+        if not spec:
+            return None
+        limits = {}
+        for item in spec.split(','):
+            family, _, value = item.partition('=')
+            rate, _, burst = value.partition(':')
+            limits[family.strip()] = (
+                (float(rate), float(burst)) if burst else float(rate)
+            )
+        return cls(default_cache_dir() / f"ratelimit-{account_key()}.json", limits)
+
+    def _load(
+        self,
+    ) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _dump(
+        self,
+        state: dict,
+    ) -> None:
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def _bucket(
+        self,
+        state: dict,
+        family: str,
+        now: float,
+    ) -> tuple[str, dict] | tuple[None, None]:
+        if family not in self.limits:
+            family = DEFAULT_FAMILY
+        if family not in self.limits:
+            return None, None
+        rate, burst = self.limits[family]
+        bucket = state.setdefault(
+            family, {'tokens': burst, 'updated': now, 'blocked_until': 0.0, 'rate': rate}
+        )
+        return family, bucket
+
+    def reserve(
+        self,
+        url: str,
+    ) -> float:
+        """
+        Takes a token for the family of `url`.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait before sending the request.
+        """
+        now = time.time()
+        with self.lock:
+            state = self._load()
+            family, bucket = self._bucket(state, endpoint_family(url), now)
+            if bucket is None:
+                return 0.0
+            configured, burst = self.limits[family]
+            rate = max(MIN_RATE, bucket['rate'])
+            tokens = min(burst, bucket['tokens'] + (now - bucket['updated']) * rate)
+            tokens -= 1.0
+            bucket['tokens'] = tokens
+            bucket['updated'] = now
+            bucket['rate'] = min(configured, rate + self.recovery * configured)
+            self._dump(state)
+        return max(bucket['blocked_until'] - now, -tokens / rate if tokens < 0 else 0.0, 0.0)
+
+    def penalize(
+        self,
+        url: str,
+        retry_after: float,
+    ) -> None:
+        """
+        Blocks the family of `url` for `retry_after` seconds in every
+        process and lowers its rate.
+        """
+        now = time.time()
+        with self.lock:
+            state = self._load()
+            family, bucket = self._bucket(state, endpoint_family(url), now)
+            if bucket is None:
+                return
+            configured, _ = self.limits[family]
+            bucket['blocked_until'] = max(bucket['blocked_until'], now + retry_after)
+            bucket['rate'] = max(self.floor * configured, bucket['rate'] * self.backoff)
+            self._dump(state)
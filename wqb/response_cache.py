@@ -0,0 +1,261 @@
+import datetime
+import http.client
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Mapping
+from typing import Any, Self
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from .cookie_store import account_key, default_cache_dir
+from .local_database import LocalDatabase
+
+__all__ = ['ResponseCache', 'make_response']
+
+DEFAULT_TTLS = {
+    'operators': 24 * 3600.0,
+    'datasets': 24 * 3600.0,
+    'fields': 24 * 3600.0,
+}
+_DROPPED_HEADERS = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding', 'Set-Cookie')
+
+
+def make_response(
+    url: str,
+    status_code: int,
+    headers: Mapping[str, str],
+    content: bytes,
+) -> Response:
+    """
+    Builds a `Response` object that behaves like a received one.
+    """
+    resp = Response()
+    resp.url = url
+    resp.status_code = status_code
+    resp.reason = http.client.responses.get(status_code, '')
+    resp.headers = CaseInsensitiveDict(headers)
+    resp._content = content
+    resp._content_consumed = True
+    resp.elapsed = datetime.timedelta(0)
+    return resp
+
+
+class ResponseCache(LocalDatabase):
+    """
+    A persistent, size-bounded cache of GET responses, keyed by URL and
+    shared by all processes through SQLite. Responses depend on the
+    account, so the default database is keyed by `API_KEY` and
+    `WQB_API_BASE_URL`; an explicit `path` should not be shared by
+    accounts either.
+
+    Each entry is fresh for the TTL of its endpoint. A stale entry with
+    an `ETag` or `Last-Modified` is revalidated with a conditional
+    request; a 304 renews it without downloading the body again. When
+    the stored bodies exceed `max_bytes`, the least recently used
+    entries are evicted.
+
+    Attributes:
+        hits (int): Fresh entries served without a request.
+        revalidations (int): Stale entries renewed by a 304.
+        misses (int): Lookups that needed a full download.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        *,
+        ttls: Mapping[str, float] | None = None,
+        default_ttl: float = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        if path is None:
+            path = default_cache_dir() / f"responses-{account_key()}.sqlite3"
+        super().__init__(path)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<ResponseCache [{self.path}]>"
+
+    @classmethod
+    def from_env(
+        cls,
+    ) -> Self | None:
+        """
+        Builds a cache from `WQB_RESPONSE_CACHE` (a database path, or
+        *'1'* for the default one of the account), or returns *None* if
+        it is not set.
+        """
+        path = os.environ.get('WQB_RESPONSE_CACHE')
+        if not path or path in ('0', 'false', 'no'):
+            return None
+        return cls(None if path in ('1', 'true', 'yes') else path)
+
+    @property
+    def stats(
+        self,
+    ) -> dict[str, int]:
+        """
+        The hit, revalidation and miss counters.
+        """
+        return {
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses,
+        }
+
+    def _create(
+        self,
+        conn: sqlite3.Connection,
+    ) -> None:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, endpoint TEXT NOT NULL, status INTEGER NOT NULL, '
+            'headers TEXT NOT NULL, content BLOB NOT NULL, size INTEGER NOT NULL, '
+            'stored_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)'
+        )
+
+    def lookup(
+        self,
+        endpoint: str,
+        url: str,
+    ) -> tuple[Response | None, bool]:
+        """
+        Returns the cached response of `url`, if any, and whether it is
+        still fresh.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT status, headers, content, stored_at FROM responses WHERE url = ?',
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None, False
+            conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (now, url))
+            conn.commit()
+        status, headers, content, stored_at = row
+        fresh = now - stored_at < self.ttls.get(endpoint, self.default_ttl)
+        return make_response(url, status, json.loads(headers), content), fresh
+
+    @staticmethod
+    def validators(
+        resp: Response,
+    ) -> dict[str, str]:
+        """
+        Returns the conditional request headers for `resp`.
+        """
+        headers = {}
+        if 'ETag' in resp.headers:
+            headers['If-None-Match'] = resp.headers['ETag']
+        if 'Last-Modified' in resp.headers:
+            headers['If-Modified-Since'] = resp.headers['Last-Modified']
+        return headers
+
+    def renew(
+        self,
+        url: str,
+    ) -> None:
+        """
+        Marks the entry of `url` as freshly validated.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?',
+                (now, now, url),
+            )
+            conn.commit()
+
+    def store(
+        self,
+        endpoint: str,
+        url: str,
+        resp: Response,
+    ) -> None:
+        """
+        Stores `resp` as the entry of `url` and evicts old entries if
+        the cache grew past `max_bytes`.
+        """
+        headers = {
+            key: value
+            for key, value in resp.headers.items()
+            if key.title() not in _DROPPED_HEADERS
+        }
+        content = resp.content
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, endpoint, resp.status_code, json.dumps(headers), content, len(content), now, now),
+            )
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if self.max_bytes < total:
+                self._evict(conn, total - int(0.9 * self.max_bytes))
+            conn.commit()
+
+    @staticmethod
+    def _evict(
+        conn: sqlite3.Connection,
+        excess: int,
+    ) -> None:
+        freed = 0
+        urls = []
+        for url, size in conn.execute('SELECT url, size FROM responses ORDER BY accessed_at'):
+            if excess <= freed:
+                break
+            urls.append((url,))
+            freed += size
+        conn.executemany('DELETE FROM responses WHERE url = ?', urls)
+
+    def clear(
+        self,
+    ) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM responses')
+            conn.commit()
+
+    def get(
+        self,
+        session: Any,
+        endpoint: str,
+        url: str,
+        **kwargs,
+    ) -> Response:
+        """
+        Serves a GET of `url` through the cache, sending it with
+        `session.get` on a miss or to revalidate a stale entry.
+
+        Notes
+        -----
+        `kwargs` are passed to `session.get`.
+        """
+        cached, fresh = self.lookup(endpoint, url)
+        if cached is not None and fresh:
+            self.hits += 1
+            return cached
+        if cached is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.validators(cached)}
+        resp = session.get(url, **kwargs)
+        if cached is not None and 304 == resp.status_code:
+            self.revalidations += 1
+            self.renew(url)
+            return cached
+        self.misses += 1
+        if 200 == resp.status_code:
+            self.store(endpoint, url, resp)
+        return resp
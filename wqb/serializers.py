@@ -0,0 +1,93 @@
+import os
+from typing import Any
+
+__all__ = ['register_serializers', 'serializer_profile']
+
+SERIALIZERS = ('json', 'orjson', 'msgpack')
+COMPRESSIONS = ('gzip', 'zlib', 'bzip2', 'lzma', 'zstd')
+
+
+def _orjson_default(
+    obj: Any,
+) -> Any:
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='replace')
+    return str(obj)
+
+
+def register_serializers() -> None:
+    """
+    Registers the *'orjson'* serializer with kombu, if `orjson` is
+    installed. kombu registers *'msgpack'* itself.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return
+    from kombu.serialization import register
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(
+            obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS
+        )
+
+    register(
+        'orjson',
+        dumps,
+        orjson.loads,
+        content_type='application/x-orjson',
+        content_encoding='binary',
+    )
+
+
+def serializer_profile(
+    serializer: str | None = None,
+    compression: str | None = None,
+) -> dict[str, Any]:
+    """
+    Returns the Celery settings of a serializer profile and registers
+    the serializers it needs.
+
+    Parameters
+    ----------
+    serializer: str | None = None
+        One of `SERIALIZERS`. If *None*, `WQB_SERIALIZER` is used, or
+        *'json'* if it is not set.
+    compression: str | None = None
+        One of `COMPRESSIONS`. If *None*, `WQB_COMPRESSION` is used, or
+        no compression if it is not set.
+
+    Returns
+    -------
+    dict[str, Any]
+        The settings, for `Celery.conf.update` or a config module.
+
+    Notes
+    -----
+    *'json'* is always accepted, so workers still read messages from
+    producers without the profile while a change rolls out.
+    """
+    serializer = (serializer or os.environ.get('WQB_SERIALIZER') or 'json').lower()
+    compression = (compression or os.environ.get('WQB_COMPRESSION') or '').lower() or None
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"<{serializer=}> is not one of {SERIALIZERS}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"<{compression=}> is not one of {COMPRESSIONS}")
+    if 'orjson' == serializer:
+        import orjson  # noqa: F401, fails early if the extra is missing
+    elif 'msgpack' == serializer:
+        import msgpack  # noqa: F401
+    if 'zstd' == compression:
+        import zstandard  # noqa: F401
+    register_serializers()
+    accept = sorted({'json', serializer})
+    return {
+        'task_serializer': serializer,
+        'result_serializer': serializer,
+        'accept_content': accept,
+        'result_accept_content': accept,
+        'task_compression': compression,
+        'result_compression': compression,
+    }
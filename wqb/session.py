@@ -1,7 +1,9 @@
 import os
 import logging
-from time import sleep
+from time import sleep, time
 import requests
+from .cookie_store import CookieStore
+from .transport import DEFAULT_TIMEOUT, configure_session
 
 __all__ = ['ApiClient']
 
@@ -15,12 +17,22 @@ class ApiClient:
         domain (str): API 服务域名
         api_key (str): 用于认证的 API Key
         cookie (Optional[str]): 存储当前有效的 cookie
+        cookie_updated_at (Optional[float]): cookie 的获取时间戳
+        cookie_store (Optional[CookieStore]): 跨进程共享的 cookie 缓存，
+            设置环境变量 WQB_COOKIE_CACHE=0 可禁用
     """
     
-    def __init__(self):
+    def __init__(self, cookie_store: CookieStore | None = None):
         self.domain = os.getenv('API_DOMAIN')
         self.api_key = os.getenv('API_KEY')
         self.cookie = None
+        self.cookie_updated_at = None
+        if cookie_store is None and os.getenv('WQB_COOKIE_CACHE', '1') not in ('0', 'false', 'no'):
+            cookie_store = CookieStore(self.domain, self.api_key)
+        self.cookie_store = cookie_store
+        # 登录请求与返回给调用方的 session 各自复用连接池，避免重复 TLS 握手
+        self._login_http = configure_session(requests.Session(), pool_maxsize=2)
+        self._session = configure_session(requests.Session())
 
     def _request_cookie(self, old_cookie: str = None, force_update: bool = False) -> str:
         """
@@ -42,7 +54,7 @@ class ApiClient:
 
         for attempt in range(1, 4):
             try:
-                response = requests.post(url, headers=headers, json=payload)
+                response = self._login_http.post(url, headers=headers, json=payload, timeout=DEFAULT_TIMEOUT)
                 response.raise_for_status()
                 data = response.json()
                 logger.info(f"Login response: {data}")
@@ -55,21 +67,83 @@ class ApiClient:
 
     def login(self, force_update: bool = False) -> requests.Session:
         """
-        登录并获取新的 cookie，然后构造带有 cookie 的 session。
+        登录并获取新的 cookie，然后更新复用的 session 的 cookie。
 
         Args:
             force_update (bool): 是否强制刷新 cookie
 
         Returns:
-            requests.Session: 带有最新 cookie 的 session 对象
+            requests.Session: 带有最新 cookie 的 session 对象（多次调用返回同一对象）
         """
         # 获取或刷新 cookie
-        self.cookie = self._request_cookie(old_cookie=self.cookie, force_update=force_update)
-        # 构建 session
-        session = requests.Session()
+        if self.cookie_store is None:
+            self.cookie = self._request_cookie(old_cookie=self.cookie, force_update=force_update)
+            if self.cookie:
+                self.cookie_updated_at = time()
+        else:
+            self._login_shared(force_update=force_update)
+        # 更新复用的 session
         if self.cookie:
-            session.headers.update({"Cookie": self.cookie})
-        return session
+            self._session.headers.update({"Cookie": self.cookie})
+        return self._session
+
+    def _login_shared(self, force_update: bool = False) -> None:
+        """
+        通过共享缓存登录：同一时刻只有一个进程请求登录接口。
+
+        持有缓存锁后，如果缓存中的 cookie 与本进程持有的不同，说明其他进程
+        已经刷新过，直接采用；否则请求新的 cookie 并写回缓存。
+
+        Args:
+            force_update (bool): 是否强制刷新
+        """
+        with self.cookie_store.lock:
+            cookie, updated_at = self.cookie_store.read()
+            if not force_update and cookie and cookie != self.cookie:
+                logger.info(f"Using cookie refreshed by another process at {updated_at}")
+                self.cookie, self.cookie_updated_at = cookie, updated_at
+                return
+            self.cookie = self._request_cookie(old_cookie=self.cookie, force_update=force_update)
+            if self.cookie:
+                self.cookie_updated_at = self.cookie_store.write(self.cookie)
+
+    @property
+    def cookie_age(self) -> float:
+        """
+        当前 cookie 的年龄（秒），尚未获取 cookie 时为 inf。
+        """
+        if self.cookie is None or self.cookie_updated_at is None:
+            return float('inf')
+        return time() - self.cookie_updated_at
+
+    def refresh(self, max_age: float) -> bool:
+        """
+        在 cookie 过期前主动刷新。
+
+        使用共享缓存时，如果其他进程已在 max_age 内刷新过，直接采用其 cookie，
+        不再请求登录接口。
+
+        Args:
+            max_age (float): cookie 的最长使用时间（秒）
+
+        Returns:
+            bool: cookie 是否发生了变化
+        """
+        old_cookie = self.cookie
+        if self.cookie_store is None:
+            if self.cookie_age >= max_age:
+                self.login(force_update=True)
+            return self.cookie != old_cookie
+        with self.cookie_store.lock:
+            cookie, updated_at = self.cookie_store.read()
+            if cookie and time() - updated_at < max_age:
+                self.cookie, self.cookie_updated_at = cookie, updated_at
+            else:
+                cookie = self._request_cookie(old_cookie=self.cookie, force_update=True)
+                if cookie:
+                    self.cookie = cookie
+                    self.cookie_updated_at = self.cookie_store.write(cookie)
+        return self.cookie != old_cookie
 
     def get_session(self, force_update=False) -> requests.Session:
         """
@@ -81,6 +155,5 @@ class ApiClient:
         if not self.cookie:
             # 首次获取默认使用非强制刷新
             return self.login(force_update=force_update)
-        session = requests.Session()
-        session.headers.update({"Cookie": self.cookie})
-        return session
\ No newline at end of file
+        self._session.headers.update({"Cookie": self.cookie})
+        return self._session
\ No newline at end of file
@@ -0,0 +1,352 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Protocol, Self
+from requests import Response
+from .cookie_store import account_key, default_cache_dir
+from .local_database import LocalDatabase
+from .response_cache import make_response
+
+__all__ = [
+    'simulation_key',
+    'SimulationStore',
+    'SQLiteSimulationStore',
+    'MongoSimulationStore',
+    'SimulationCache',
+]
+
+_COMPLETE_STATUSES = ('COMPLETE', 'WARNING')
+
+
+def simulation_key(
+    target: dict[str, Any] | list[dict[str, Any]],
+    account: str | None = None,
+) -> str:
+    """
+    Returns the canonical hash of an alpha or multi-alpha payload.
+
+    Keys are sorted at every level, so payloads that differ only in the
+    order of their keys or settings share a key. The order of the alphas
+    of a multi-alpha is kept, as it is the order of its children. If
+    `account` is given, it is hashed along, so the same payload of two
+    accounts has two keys.
+    """
+    canonical = json.dumps(
+        target, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    if account is not None:
+        canonical = f"{account}\0{canonical}"
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SimulationStore(Protocol):
+    """
+    The storage of a `SimulationCache`.
+    """
+
+    def get(
+        self,
+        key: str,
+    ) -> tuple[str, bytes, float] | None:
+        """
+        Returns the location, body and storage time of `key`, if any.
+        """
+        ...
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        content: bytes,
+    ) -> None:
+        """
+        Stores the location and body of `key`.
+        """
+        ...
+
+    def delete(
+        self,
+        key: str,
+    ) -> None:
+        """
+        Deletes the entry of `key`, if any.
+        """
+        ...
+
+
+class SQLiteSimulationStore(LocalDatabase):
+    """
+    A `SimulationStore` in a local SQLite database, shared by all
+    processes on the host.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+    ) -> None:
+        super().__init__(path if path is not None else default_cache_dir() / 'simulations.sqlite3')
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<SQLiteSimulationStore [{self.path}]>"
+
+    def _create(
+        self,
+        conn: sqlite3.Connection,
+    ) -> None:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS simulations ('
+            'key TEXT PRIMARY KEY, url TEXT NOT NULL, content BLOB NOT NULL, '
+            'stored_at REAL NOT NULL)'
+        )
+
+    def get(
+        self,
+        key: str,
+    ) -> tuple[str, bytes, float] | None:
+        with self._lock:
+            return self._connect().execute(
+                'SELECT url, content, stored_at FROM simulations WHERE key = ?', (key,)
+            ).fetchone()
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        content: bytes,
+    ) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO simulations VALUES (?, ?, ?, ?)',
+                (key, url, content, time.time()),
+            )
+            conn.commit()
+
+    def delete(
+        self,
+        key: str,
+    ) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM simulations WHERE key = ?', (key,))
+            conn.commit()
+
+
+class MongoSimulationStore:
+    """
+    A `SimulationStore` in a MongoDB collection, shared by all hosts.
+
+    The client is created on first use in each process, as `MongoClient`
+    is not fork-safe. Entries are removed by a TTL index on `stored_at`
+    once they are older than `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        *,
+        database: str = 'wqb',
+        collection: str = 'simulations',
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        uri: str
+            The MongoDB connection URI.
+        database: str = 'wqb'
+            The database of the collection.
+        collection: str = 'simulations'
+            The collection of the entries.
+        ttl: float | None = None
+            The lifetime of the entries. If *None*, MongoDB keeps them.
+        """
+        self.uri = uri
+        self.database = database
+        self.collection = collection
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._collection = None
+        self._pid = None
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<MongoSimulationStore [{self.database}.{self.collection}]>"
+
+    def _connect(
+        self,
+    ) -> Any:
+        with self._lock:
+            if self._collection is None or self._pid != os.getpid():
+                from pymongo import MongoClient
+                collection = MongoClient(self.uri)[self.database][self.collection]
+                if self.ttl is not None:
+                    collection.create_index('stored_at', expireAfterSeconds=int(self.ttl))
+                self._collection = collection
+                self._pid = os.getpid()
+            return self._collection
+
+    def get(
+        self,
+        key: str,
+    ) -> tuple[str, bytes, float] | None:
+        doc = self._connect().find_one({'_id': key})
+        if doc is None:
+            return None
+        stored_at = doc['stored_at'].replace(tzinfo=datetime.timezone.utc).timestamp()
+        return doc['url'], bytes(doc['content']), stored_at
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        content: bytes,
+    ) -> None:
+        self._connect().replace_one(
+            {'_id': key},
+            {
+                'url': url,
+                'content': content,
+                'stored_at': datetime.datetime.now(datetime.timezone.utc),
+            },
+            upsert=True,
+        )
+
+    def delete(
+        self,
+        key: str,
+    ) -> None:
+        self._connect().delete_one({'_id': key})
+
+
+class SimulationCache:
+    """
+    A cache of completed simulation results, keyed by `simulation_key`
+    of the simulated payload and the account.
+
+    `WQBSession.simulate` looks a payload up before posting it and
+    serves a fresh entry without simulating; it stores every simulation
+    that completes with status *COMPLETE* or *WARNING*.
+
+    Attributes:
+        hits (int): Payloads served from the cache.
+        misses (int): Payloads that had to be simulated.
+    """
+
+    def __init__(
+        self,
+        store: SimulationStore | None = None,
+        *,
+        ttl: float | None = 7 * 24 * 3600.0,
+        account: str | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        store: SimulationStore | None = None
+            The storage of the entries. If *None*, a
+            `SQLiteSimulationStore` at its default path is used.
+        ttl: float | None = 7 * 24 * 3600.0
+            The seconds an entry stays fresh. If *None*, it never
+            expires.
+        account: str | None = None
+            The account the entries belong to, as a simulation location
+            and alpha id are only readable by the account that created
+            them. If *None*, `account_key()` of `API_KEY` and
+            `WQB_API_BASE_URL` is used.
+        """
+        self.store = store if store is not None else SQLiteSimulationStore()
+        self.ttl = ttl
+        self.account = account_key() if account is None else account
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<SimulationCache [{self.store}]>"
+
+    @classmethod
+    def from_env(
+        cls,
+    ) -> Self | None:
+        """
+        Builds a cache from `WQB_SIM_CACHE` (a `mongodb://` URI, a
+        database path, or *'1'* for the default SQLite database) and
+        `WQB_SIM_CACHE_TTL`, or returns *None* if it is not set.
+        """
+        spec = os.environ.get('WQB_SIM_CACHE')
+        if not spec or spec in ('0', 'false', 'no'):
+            return None
+        ttl = float(os.environ.get('WQB_SIM_CACHE_TTL', 7 * 24 * 3600.0)) or None
+        if spec.startswith(('mongodb://', 'mongodb+srv://')):
+            store = MongoSimulationStore(spec, ttl=ttl)
+        else:
+            store = SQLiteSimulationStore(None if spec in ('1', 'true', 'yes') else spec)
+        return cls(store, ttl=ttl)
+
+    @property
+    def stats(
+        self,
+    ) -> dict[str, int | float]:
+        """
+        The hit and miss counters and the hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def lookup(
+        self,
+        target: dict[str, Any] | list[dict[str, Any]],
+    ) -> Response | None:
+        """
+        Returns the cached result of `target`, or *None* if it has no
+        fresh entry.
+        """
+        key = simulation_key(target, self.account)
+        entry = self.store.get(key)
+        if entry is not None and self.ttl is not None and self.ttl <= time.time() - entry[2]:
+            self.store.delete(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        url, content, _ = entry
+        return make_response(url, 200, {'Content-Type': 'application/json'}, content)
+
+    def put(
+        self,
+        target: dict[str, Any] | list[dict[str, Any]],
+        resp: Response,
+    ) -> bool:
+        """
+        Stores `resp` as the result of `target` if the simulation
+        completed successfully.
+
+        Returns
+        -------
+        bool
+            Whether `resp` was stored.
+        """
+        if 200 != resp.status_code:
+            return False
+        try:
+            status = resp.json().get('status', '').upper()
+        except ValueError:
+            return False
+        if status not in _COMPLETE_STATUSES:
+            return False
+        self.store.put(simulation_key(target, self.account), resp.url, resp.content)
+        return True
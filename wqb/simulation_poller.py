@@ -0,0 +1,291 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Self
+from requests import Response
+from . import GET, RETRY_AFTER
+from .auto_auth_session import TRANSPORT_ERRORS, AutoAuthSession
+
+__all__ = ['SimulationPoller']
+
+
+@dataclass(slots=True)
+class _Watch:
+
+    url: str
+    expected: Callable[[Response], bool]
+    tries: Iterator[Any]
+    future: asyncio.Future
+    kwargs: dict[str, Any]
+    max_key_errors: int
+    max_value_errors: int
+    delay_key_error: float
+    delay_value_error: float
+    count: int = field(default=0)
+    key_errors: int = field(default=0)
+    value_errors: int = field(default=0)
+    resp: Response | None = field(default=None)
+
+
+class SimulationPoller:
+    """
+    Polls many simulation locations from one scheduler.
+
+    Outstanding locations are kept in a heap ordered by the time their
+    `Retry-After` is due. A single driver coroutine pops due locations,
+    starts their GET requests no faster than `max_qps` and with at most
+    `max_in_flight` open at once, and resolves the future of each
+    location once its response is expected. The number of timers and the
+    poll rate therefore stay flat however many simulations are in flight.
+    """
+
+    def __init__(
+        self,
+        session: AutoAuthSession,
+        *,
+        max_qps: float = 10.0,
+        max_in_flight: int | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Initializes a `SimulationPoller` object.
+
+        Parameters
+        ----------
+        session: AutoAuthSession
+            The session that sends the polls through `arequest`.
+        max_qps: float = 10.0
+            The maximum number of polls started per second.
+        max_in_flight: int | None = None
+            The maximum number of polls awaiting a response. If *None*,
+            `session.max_workers` is used.
+        logger: logging.Logger | None = None
+            The `logging.Logger` object. If *None*, `session.logger` is
+            used.
+
+        Returns
+        -------
+        None
+        """
+        self.session = session
+        self.max_qps = max(1e-3, max_qps)
+        self.max_in_flight = max(
+            1, session.max_workers if max_in_flight is None else max_in_flight
+        )
+        self.logger = session.logger if logger is None else logger
+        self.polls = 0
+        self._heap = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._polling: dict[asyncio.Task, _Watch] = {}
+        self._next_start = 0.0
+        self._driver = None
+
+    def __repr__(
+        self,
+    ) -> str:
+        return f"<SimulationPoller [{self.pending} pending, {self.max_qps} qps]>"
+
+    @property
+    def pending(
+        self,
+    ) -> int:
+        """
+        The number of locations not resolved yet.
+        """
+        return len(self._heap) + len(self._polling)
+
+    async def watch(
+        self,
+        url: str,
+        *,
+        expected: Callable[[Response], bool],
+        max_tries: int | Iterable[Any] = range(600),
+        max_key_errors: int = 1,
+        max_value_errors: int = 1,
+        delay_key_error: float = 2.0,
+        delay_value_error: float = 2.0,
+        **kwargs,
+    ) -> Response | None:
+        """
+        Polls `url` until a response is expected, like
+        `WQBSession.retry`, but scheduled by this poller.
+
+        Parameters
+        ----------
+        url: str
+            The simulation location.
+        expected: Callable[[Response], bool]
+            Whether a response completes the watch.
+        max_tries: int | Iterable[Any] = range(600)
+            The maximum number of polls.
+
+        Returns
+        -------
+        Response | None
+            The last `Response` object, or *None* if no poll was sent.
+
+        Notes
+        -----
+        The error limits and delays mean the same as in
+        `WQBSession.retry`. `kwargs` are passed to
+        `AutoAuthSession.arequest`.
+        """
+        if isinstance(max_tries, int):
+            max_tries = range(max_tries)
+        loop = asyncio.get_running_loop()
+        watch = _Watch(
+            url=url,
+            expected=expected,
+            tries=iter(max_tries),
+            future=loop.create_future(),
+            kwargs=kwargs,
+            max_key_errors=max_key_errors,
+            max_value_errors=max_value_errors,
+            delay_key_error=delay_key_error,
+            delay_value_error=delay_value_error,
+        )
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        self._schedule(watch, 0.0)
+        return await watch.future
+
+    async def close(
+        self,
+    ) -> None:
+        """
+        Stops the driver and cancels all unresolved watches, including
+        those with a poll in flight.
+        """
+        if self._driver is not None:
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+            self._driver = None
+        for task, watch in list(self._polling.items()):
+            task.cancel()
+            watch.future.cancel()
+        for _, _, watch in self._heap:
+            watch.future.cancel()
+        self._heap.clear()
+
+    async def __aenter__(
+        self,
+    ) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        *exc_info,
+    ) -> None:
+        await self.close()
+
+    def _schedule(
+        self,
+        watch: _Watch,
+        delay: float,
+    ) -> None:
+        due = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._heap, (due, next(self._seq), watch))
+        self._wakeup.set()
+
+    def _resolve(
+        self,
+        watch: _Watch,
+    ) -> None:
+        if not watch.future.done():
+            watch.future.set_result(watch.resp)
+
+    async def _drive(
+        self,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            if self._heap[0][2].future.done():
+                # abandoned by its caller, or cancelled
+                heapq.heappop(self._heap)
+                continue
+            now = loop.time()
+            wait = max(self._heap[0][0], self._next_start) - now
+            if 0 < wait:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except TimeoutError:
+                    pass
+                continue
+            await self._slots.acquire()
+            _, _, watch = heapq.heappop(self._heap)
+            if watch.future.done():
+                self._slots.release()
+                continue
+            self._next_start = max(now, self._next_start) + 1.0 / self.max_qps
+            task = loop.create_task(self._poll(watch))
+            self._polling[task] = watch
+            task.add_done_callback(self._forget)
+
+    def _forget(
+        self,
+        task: asyncio.Task,
+    ) -> None:
+        # released here rather than in `_poll`, as a task cancelled
+        # before it started never runs its body
+        self._polling.pop(task, None)
+        self._slots.release()
+
+    async def _poll(
+        self,
+        watch: _Watch,
+    ) -> None:
+        try:
+            try:
+                next(watch.tries)
+            except StopIteration:
+                self.logger.warning(
+                    f"{self}._poll(...) [max {watch.count} tries ran out]: {watch.url}"
+                )
+                self._resolve(watch)
+                return
+            watch.count += 1
+            self.polls += 1
+            watch.resp = resp = await self.session.arequest(GET, watch.url, **watch.kwargs)
+        except asyncio.CancelledError:
+            watch.future.cancel()
+            raise
+        except TRANSPORT_ERRORS as e:
+            self.logger.warning(f"{self}._poll(...) [{watch.count} tries]: {repr(e)}")
+            self._schedule(watch, 3.0)
+            return
+        except Exception as e:
+            if not watch.future.done():
+                watch.future.set_exception(e)
+            return
+        if watch.expected(resp):
+            self._resolve(watch)
+            return
+        if 504 == resp.status_code:
+            self._schedule(watch, 3.0)
+            return
+        try:
+            self._schedule(watch, float(resp.headers[RETRY_AFTER]))
+        except KeyError:
+            watch.key_errors += 1
+            if watch.max_key_errors <= watch.key_errors:
+                self._resolve(watch)
+            else:
+                self._schedule(watch, watch.delay_key_error)
+        except ValueError:
+            watch.value_errors += 1
+            if watch.max_value_errors <= watch.value_errors:
+                self._resolve(watch)
+            else:
+                self._schedule(watch, watch.delay_value_error)
@@ -1,10 +1,16 @@
 from celery import Celery, Task
 from . import wqb_session
-from celery.signals import worker_process_init
+from .adaptive_limiter import AdaptiveLimiter
+from .blob_store import BlobStore
+from .multi_alpha_packer import MultiAlphaPacker
+from .simulation_cache import SimulationCache
+from .simulation_poller import SimulationPoller
+from celery.signals import worker_process_init, worker_process_shutdown
 from celery.utils.log import get_task_logger
+import asyncio
+import json
 import threading
 import os
-import time
 
 # Create a Celery app instance
 app = Celery('wqb')
@@ -12,8 +18,20 @@ app = Celery('wqb')
 # Load the configuration from the celeryconfig.py file
 app.config_from_object('celeryconfig')
 
-# Create a lock to ensure only one simulation task runs at a time per worker process
-simulation_lock = threading.Lock()
+# 每个工作进程内同时运行的模拟任务数上限，默认 1 即每个进程一次只跑一个任务；
+# 使用 threads 等并发池时可以调大，各任务共享同一个事件循环和异步资源
+simulation_slots = threading.BoundedSemaphore(int(os.environ.get('WQB_TASK_SLOTS', 1)))
+
+# 由 WQB_SIM_CACHE 启用的模拟结果缓存，相同的 alpha 不再重复模拟
+simulation_cache = SimulationCache.from_env()
+
+# 批量任务中每个进程同时进行的模拟数上限
+batch_concurrency = int(os.environ.get('WQB_BATCH_CONCURRENCY', 3))
+
+# 结果按 JSON 编码超过 result_max_bytes 字节时，完整的 response_json / children_json 压缩存入本地
+# blob 存储，结果中只保留关键字段摘要和按 sha256 的引用；0 表示不压缩
+result_max_bytes = int(os.environ.get('WQB_RESULT_MAX_BYTES', 32 * 1024))
+blob_store = BlobStore(os.environ.get('WQB_BLOB_DIR'))
 
 # Get the logger for this module
 logger = get_task_logger(__name__)
@@ -25,10 +43,23 @@ def _log_response(logger, response):
     except Exception:
         logger.debug(f"Response text: {response.text}")
 
+def _response_json(response):
+    """Returns the JSON of a response, or None if there is none."""
+    try:
+        return response.json()
+    except (AttributeError, ValueError):
+        return None
+
 def _format_sim_result(logger, input_data, response):
     """
     Formats the simulation result for the backend based on the response.
+    A SimulationResult also carries the child simulations of a multi_alpha,
+    which are returned as 'children_json' so the backend needs no WQB requests.
     """
+    children = None
+    if isinstance(response, wqb_session.SimulationResult):
+        response, children = response.parent, response.children
+
     if response is None or not response.ok:
         logger.warning(f"Invalid response for input: {str(input_data)[:200]}...")
         return {
@@ -45,15 +76,18 @@ def _format_sim_result(logger, input_data, response):
         status = response_json.get('status', 'UNKNOWN').upper()
 
         if status in ('COMPLETE', 'WARNING'):
-            return {'success': True, 'input': input_data, 'response_json': response_json}
+            result = {'success': True, 'input': input_data, 'response_json': response_json}
         else:
             logger.warning(f"Simulation finished with non-success status: {status}")
-            return {
+            result = {
                 'success': False,
                 'error': f'Simulation failed with status: {status}',
                 'input': input_data,
                 'response_json': response_json
             }
+        if children:
+            result['children_json'] = [_response_json(child) for child in children]
+        return result
     except ValueError:  # JSONDecodeError
         logger.error("Failed to decode JSON response.", exc_info=True)
         return {
@@ -63,18 +97,57 @@ def _format_sim_result(logger, input_data, response):
             'response_json': response.text
         }
 
+# 摘要中保留的模拟字段与 IS 指标
+_SUMMARY_KEYS = ('id', 'alpha', 'type', 'status', 'message')
+_SUMMARY_METRICS = ('sharpe', 'fitness', 'turnover', 'returns', 'drawdown', 'margin', 'pnl', 'longCount', 'shortCount')
+
+def _summarize(response_json, ref):
+    """Keeps the key fields of a simulation response, typed, plus the reference to the full payload."""
+    if isinstance(response_json, str):
+        return {'text': response_json[:1000], 'payload_ref': ref}
+    if not isinstance(response_json, dict):
+        return {'payload_ref': ref}
+    summary = {key: str(response_json[key]) for key in _SUMMARY_KEYS if response_json.get(key) is not None}
+    if isinstance(response_json.get('children'), list):
+        summary['children'] = [str(child) for child in response_json['children']]
+    metrics = response_json.get('is')
+    if isinstance(metrics, dict):
+        summary['is'] = {
+            key: float(metrics[key]) for key in _SUMMARY_METRICS
+            if isinstance(metrics.get(key), (int, float)) and not isinstance(metrics.get(key), bool)
+        }
+    summary['payload_ref'] = ref
+    return summary
+
+def _compact_result(result):
+    """
+    Replaces large response payloads of a formatted result with summaries once the
+    result exceeds result_max_bytes; the full payloads go to blob_store.
+    """
+    if not result_max_bytes or len(json.dumps(result, ensure_ascii=False, default=str).encode()) <= result_max_bytes:
+        return result
+    ref = blob_store.put({
+        'response_json': result.get('response_json'),
+        'children_json': result.get('children_json'),
+    })
+    result['response_json'] = _summarize(result.get('response_json'), ref)
+    if result.get('children_json') is not None:
+        result['children_json'] = [None if child is None else _summarize(child, ref) for child in result['children_json']]
+    result['payload_ref'] = ref
+    return result
+
 # 改进的全局会话管理
 class GlobalWQBSessionManager:
     def __init__(self):
         self._session = None
         self._session_lock = threading.Lock()
-        self._created_at = None
         self._process_id = None
-        self._session_timeout = 3600 * 4  # 4小时后重新创建会话
+        # cookie 在过期前由后台线程主动刷新，会话及其连接池在进程内一直复用
+        self._cookie_max_age = float(os.environ.get('WQB_COOKIE_MAX_AGE', 3600 * 3))
+        self._cookie_check_interval = float(os.environ.get('WQB_COOKIE_CHECK_INTERVAL', 60))
     
     def get_session(self, task_logger=None):
         current_process_id = os.getpid()
-        current_time = time.time()
         
         log = task_logger or logger
 
@@ -82,14 +155,16 @@ class GlobalWQBSessionManager:
             # 检查是否需要创建新会话
             need_new_session = (
                 self._session is None or
-                self._process_id != current_process_id or  # 进程重启了
-                (self._created_at and current_time - self._created_at > self._session_timeout)  # 会话过期
+                self._process_id != current_process_id  # 进程重启了
             )
             
             if need_new_session:
                 log.debug(f"Creating new WQB session for process {current_process_id}")
                 self._session = wqb_session.WQBSession(logger=log)
-                self._created_at = current_time
+                self._session.start_auto_refresh(
+                    max_age=self._cookie_max_age,
+                    interval=self._cookie_check_interval,
+                )
                 self._process_id = current_process_id
                 log.debug(f"WQB session created successfully for process {current_process_id}")
             else:
@@ -100,6 +175,91 @@ class GlobalWQBSessionManager:
 # 全局会话管理器
 session_manager = GlobalWQBSessionManager()
 
+class EventLoopThread:
+    """
+    每个进程一个常驻事件循环，运行在独立的守护线程中。
+    任务把协程提交到这个循环上执行，因此多个任务可以同时有模拟在进行，
+    轮询器等异步资源也可以在任务之间复用。fork 出的子进程在首次使用时创建自己的循环。
+    """
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._process_id = None
+        self._poller = None
+        self._packer = None
+        # 所有模拟共用的轮询器每秒请求上限，0 表示每个模拟各自轮询
+        self._poll_qps = float(os.environ.get('WQB_POLL_QPS', 5))
+        # 把同进程内设置相同的单个 alpha 合并为 MultiAlpha 模拟，最多 pack_size 个、最多等待 pack_window 秒；
+        # pack_size 不大于 1 时不合并
+        self._pack_size = max(1, int(os.environ.get('WQB_PACK_SIZE', 0)))
+        self._pack_window = float(os.environ.get('WQB_PACK_WINDOW', 2))
+
+    def get_loop(self):
+        current_process_id = os.getpid()
+        with self._lock:
+            if self._loop is None or self._process_id != current_process_id:
+                # fork 继承来的循环属于父进程的线程，在子进程中不可用，直接丢弃
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='wqb-event-loop',
+                    daemon=True,
+                )
+                self._thread.start()
+                self._process_id = current_process_id
+                self._poller = None
+                self._packer = None
+            return self._loop
+
+    def get_poller(self, wqbs):
+        """获取本进程共用的模拟轮询器，未启用时返回 None"""
+        if not self._poll_qps:
+            return None
+        self.get_loop()
+        with self._lock:
+            if self._poller is None or self._poller.session is not wqbs:
+                self._poller = SimulationPoller(wqbs, max_qps=self._poll_qps)
+            return self._poller
+
+    def get_packer(self, wqbs):
+        """获取本进程共用的 MultiAlpha 合并器，未启用时返回 None"""
+        if self._pack_size <= 1:
+            return None
+        poller = self.get_poller(wqbs)
+        with self._lock:
+            if self._packer is None or self._packer.session is not wqbs:
+                self._packer = MultiAlphaPacker(
+                    wqbs,
+                    size=self._pack_size,
+                    window=self._pack_window,
+                    cache=simulation_cache,
+                    max_tries=range(600),
+                    poller=poller,
+                )
+            return self._packer
+
+    def run(self, coro):
+        """在常驻事件循环上运行协程，阻塞当前线程直到其完成并返回结果"""
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop()).result()
+
+    def stop(self):
+        with self._lock:
+            if self._loop is None or self._process_id != os.getpid():
+                return
+            loop, thread, poller, packer = self._loop, self._thread, self._poller, self._packer
+            self._loop = self._thread = self._poller = self._packer = None
+        if packer is not None:
+            asyncio.run_coroutine_threadsafe(packer.close(), loop).result()
+        if poller is not None:
+            asyncio.run_coroutine_threadsafe(poller.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+# 全局事件循环线程
+event_loop = EventLoopThread()
+
 @worker_process_init.connect
 def init_worker(**kwargs):
     """Worker进程初始化时预创建WQB会话"""
@@ -107,13 +267,18 @@ def init_worker(**kwargs):
     session_manager.get_session()
     logger.info(f"Worker process {os.getpid()} initialized with WQB session")
 
+@worker_process_shutdown.connect
+def shutdown_worker(**kwargs):
+    """Worker进程退出时停止常驻事件循环"""
+    event_loop.stop()
+
 def get_wqb_session(task_logger=None):
     """获取WQB会话实例"""
     return session_manager.get_session(task_logger)
 
 class BaseSimulationTask(Task):
     """
-    任务基类，确保在任务开始前获取锁，在任务结束后（无论成功、失败或重试）释放锁。
+    任务基类，确保在任务开始前占用一个模拟槽位，在任务结束后（无论成功、失败或重试）释放。
     """
     abstract = True
 
@@ -122,14 +287,14 @@ class BaseSimulationTask(Task):
         return get_task_logger(self.name)
 
     def __call__(self, *args, **kwargs):
-        simulation_lock.acquire()
-        self.logger.debug(f"Acquired lock.")
+        simulation_slots.acquire()
+        self.logger.debug(f"Acquired simulation slot.")
         try:
             # bind=True makes self the task instance
             return super().__call__(*args, **kwargs)
         finally:
-            simulation_lock.release()
-            self.logger.debug(f"Released lock.")
+            simulation_slots.release()
+            self.logger.debug(f"Released simulation slot.")
 
 @app.task(base=BaseSimulationTask, bind=True)
 def simulate_task(self, alpha_or_multi_alpha):
@@ -139,17 +304,25 @@ def simulate_task(self, alpha_or_multi_alpha):
     try:
         self.logger.info(f"Starting single simulation.")
         wqbs = get_wqb_session(self.logger)
-        
-        import asyncio
-        response = asyncio.run(
-            wqbs.simulate(
-                alpha_or_multi_alpha,
-                max_tries=range(600),
-                log=str(self.request.id),
+
+        packer = event_loop.get_packer(wqbs)
+        if packer is not None and isinstance(alpha_or_multi_alpha, dict):
+            # 单个 alpha 交给合并器，与同进程内其他任务的 alpha 一起模拟
+            response = event_loop.run(packer.simulate(alpha_or_multi_alpha, log=str(self.request.id)))
+        else:
+            response = event_loop.run(
+                wqbs.simulate(
+                    alpha_or_multi_alpha,
+                    max_tries=range(600),
+                    poller=event_loop.get_poller(wqbs),
+                    cache=simulation_cache,
+                    # multi_alpha 的子模拟在这里并发获取，结果后端不再访问 WQB
+                    resolve_children=True,
+                    log=str(self.request.id),
+                )
             )
-        )
 
-        result = _format_sim_result(self.logger, alpha_or_multi_alpha, response)
+        result = _compact_result(_format_sim_result(self.logger, alpha_or_multi_alpha, response))
         
         self.logger.info(f"Finished single simulation. Success: {result.get('success')}")
         return result
@@ -158,4 +331,53 @@ def simulate_task(self, alpha_or_multi_alpha):
         self.logger.error(f"Task failed unexpectedly: {e}", exc_info=True)
         raise
 
+@app.task(base=BaseSimulationTask, bind=True)
+def simulate_batch_task(self, alphas_or_multi_alphas):
+    """
+    A Celery task to run many simulations concurrently in one worker process.
+    Returns one result per alpha or multi_alpha, in input order.
+    """
+    try:
+        total = len(alphas_or_multi_alphas)
+        self.logger.info(f"Starting batch simulation of {total} targets.")
+        wqbs = get_wqb_session(self.logger)
 
+        # 按账户可用的模拟槽位自适应调整并发，最多 batch_concurrency 个
+        limiter = AdaptiveLimiter(
+            initial=batch_concurrency,
+            max_limit=batch_concurrency,
+        )
+        responses = event_loop.run(
+            wqbs.concurrent_simulate(
+                alphas_or_multi_alphas,
+                limiter,
+                return_exceptions=True,
+                poller=event_loop.get_poller(wqbs),
+                max_tries=range(600),
+                cache=simulation_cache,
+                resolve_children=True,
+                log=str(self.request.id),
+            )
+        )
+
+        results = []
+        for alpha_or_multi_alpha, response in zip(alphas_or_multi_alphas, responses):
+            if isinstance(response, BaseException):
+                self.logger.warning(f"Simulation raised {response!r} for input: {str(alpha_or_multi_alpha)[:200]}...")
+                results.append({
+                    'success': False,
+                    'error': 'Simulation raised an exception',
+                    'exception': repr(response),
+                    'input': alpha_or_multi_alpha,
+                    'response_json': None
+                })
+            else:
+                results.append(_compact_result(_format_sim_result(self.logger, alpha_or_multi_alpha, response)))
+
+        succeeded = sum(1 for result in results if result.get('success'))
+        self.logger.info(f"Finished batch simulation. Success: {succeeded}/{total}")
+        return results
+
+    except Exception as e:
+        self.logger.error(f"Task failed unexpectedly: {e}", exc_info=True)
+        raise
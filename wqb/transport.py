@@ -0,0 +1,59 @@
+import os
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+__all__ = [
+    'DEFAULT_POOL_CONNECTIONS',
+    'DEFAULT_POOL_MAXSIZE',
+    'DEFAULT_TIMEOUT',
+    'configure_session',
+]
+
+DEFAULT_POOL_CONNECTIONS = int(os.environ.get('WQB_POOL_CONNECTIONS', 10))
+DEFAULT_POOL_MAXSIZE = int(os.environ.get('WQB_POOL_MAXSIZE', 64))
+DEFAULT_TIMEOUT = (
+    float(os.environ.get('WQB_CONNECT_TIMEOUT', 10.0)),
+    float(os.environ.get('WQB_READ_TIMEOUT', 120.0)),
+)
+
+
+def configure_session(
+    session: Session,
+    *,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+) -> Session:
+    """
+    Mounts keep-alive connection pools on `session` and asks for
+    compressed responses.
+
+    Parameters
+    ----------
+    session: Session
+        The `Session` object to be configured.
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS
+        The number of hosts to keep pools for.
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+        The maximum number of idle connections kept per host. It should
+        not be lower than the number of threads sending requests, or
+        sockets are discarded and re-opened with a new TLS handshake.
+    pool_block: bool = False
+        Whether to wait for a free connection instead of opening an
+        extra, non-pooled one when a pool is exhausted.
+
+    Returns
+    -------
+    Session
+        The same `Session` object.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    session.headers['Connection'] = 'keep-alive'
+    return session
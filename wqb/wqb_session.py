@@ -1,8 +1,11 @@
 import asyncio
+import collections
 import datetime
 import itertools
 import logging
+from dataclasses import dataclass, field
 from collections.abc import Awaitable, Callable, Coroutine, Generator, Iterable, Sized
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Any
 from requests import Response
 from requests.auth import HTTPBasicAuth
@@ -34,8 +37,13 @@ from . import (
     Pasteurization,
     AlphasOrder,
 )
-from .auto_auth_session import AutoAuthSession
+from .adaptive_limiter import AdaptiveLimiter
+from .auto_auth_session import TRANSPORT_ERRORS, AutoAuthSession
 from .filter_range import FilterRange
+from .rate_limiter import SharedRateLimiter
+from .response_cache import ResponseCache
+from .simulation_cache import SimulationCache
+from .simulation_poller import SimulationPoller
 from .wqb_urls import (
     ORIGIN_API_URL,
     URL_ALPHAS_ALPHAID,
@@ -52,7 +60,16 @@ from .wqb_urls import (
     WQB_API_URL,
 )
 
-__all__ = ['to_multi_alphas', 'concurrent_await', 'WQBSession']
+__all__ = [
+    'OFFSET_CAP',
+    'to_multi_alphas',
+    'concurrent_await',
+    'is_simulation_complete',
+    'SimulationResult',
+    'WQBSession',
+]
+
+OFFSET_CAP = 10000
 
 
 
@@ -105,7 +122,7 @@ def to_multi_alphas(
 async def concurrent_await(
     awaitables: Iterable[Awaitable[Any]],
     *,
-    concurrency: int | asyncio.Semaphore | None = None,
+    concurrency: int | asyncio.Semaphore | AdaptiveLimiter | None = None,
     return_exceptions: bool = False,
 ) -> Coroutine[None, None, list[Any | BaseException]]:
     """
@@ -118,10 +135,11 @@ async def concurrent_await(
     ----------
     awaitables: Iterable[Awaitable[Any]]
         The iterable series of `Awaitable` objects.
-    concurrency: int | asyncio.Semaphore | None = None
+    concurrency: int | asyncio.Semaphore | AdaptiveLimiter | None = None
         The maximum number of `Awaitable` objects that can be awaited at
         the same time. If *int | asyncio.Semaphore*, the concurrency
-        limit is set to it. If *None*, there is no concurrency limit.
+        limit is set to it. If *AdaptiveLimiter*, the limit follows it.
+        If *None*, there is no concurrency limit.
     return_exceptions: bool = False
         Whether to return exceptions instead of raising them.
 
@@ -163,6 +181,103 @@ async def concurrent_await(
     )
 
 
+def _bounded_map(
+    func: Callable[..., Any],
+    iterable: Iterable[tuple[Any, ...]],
+    concurrency: int,
+    *,
+    ordered: bool = True,
+) -> Generator[Any, None, None]:
+    """
+    Yields `func(*item)` for each item of `iterable`, computed by up to
+    `concurrency` threads with at most `concurrency` results pending, in
+    input order if `ordered`, else as they complete.
+    """
+    items = iter(iterable)
+    if concurrency <= 1:
+        for item in items:
+            yield func(*item)
+        return
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='wqb-page')
+    pending = collections.deque()
+    try:
+        for item in itertools.islice(items, concurrency):
+            pending.append(pool.submit(func, *item))
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            for item in itertools.islice(items, 1):
+                pending.append(pool.submit(func, *item))
+            yield future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _concurrency_value(
+    concurrency: asyncio.Semaphore | AdaptiveLimiter,
+) -> int:
+    if isinstance(concurrency, AdaptiveLimiter):
+        return concurrency.limit
+    return concurrency._value
+
+
+def is_simulation_complete(
+    resp: Response,
+) -> bool:
+    """
+    Returns whether a simulation progress response is final.
+
+    Parameters
+    ----------
+    resp: Response
+        The response of a GET request to a simulation location.
+
+    Returns
+    -------
+    bool
+        *True* if the simulation reached a terminal state or the response
+        is not JSON, *False* if polling should go on.
+    """
+    if not resp.ok:
+        return False  # Continue retrying on server errors
+    try:
+        data = resp.json()
+        # Stop retrying if the simulation is in a terminal state
+        status = data.get('status', '').lower()
+        if status in ('finished', 'failed', 'error', 'complete', 'warning'):
+            return True
+        # Also handle progress, if available
+        if 'progress' in data and data['progress'] >= 1:
+            return True
+        # Otherwise, continue polling
+        return False
+    except ValueError:
+        # Not a JSON response, probably an error page. Stop.
+        return True
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    """
+    The result of `WQBSession.simulate` with `resolve_children`.
+
+    Attributes:
+        parent (Response | None): The final response of the simulation,
+            or *None* if no simulation was created.
+        children (list[Response | None]): The responses of the child
+            simulations of a `MultiAlpha`, in the order of its alphas;
+            *None* for a child that could not be fetched. Empty for a
+            single `Alpha`.
+    """
+
+    parent: Response | None
+    children: list[Response | None] = field(default_factory=list)
+
+
 from .session import ApiClient
 
 class WQBSession(AutoAuthSession):
@@ -174,6 +289,7 @@ class WQBSession(AutoAuthSession):
         self,
         *,
         logger: logging.Logger | None = None,
+        response_cache: ResponseCache | None = None,
         **kwargs,
     ) -> None:
         """
@@ -184,16 +300,29 @@ class WQBSession(AutoAuthSession):
         logger: logging.Logger | None = None
             The `logging.Logger` object to log requests. If None, a new
             logger is created.
+        response_cache: ResponseCache | None = None
+            The cache for catalog lookups (`search_operators`,
+            `locate_dataset`, `locate_field`, `search_datasets_limited`
+            and `search_fields_limited`). If *None*, it is configured
+            from `WQB_RESPONSE_CACHE`, and caching is off if that is not
+            set either.
 
         Returns
         -------
         None
+
+        Notes
+        -----
+        Unless `rate_limiter` is passed in `kwargs`, a host-wide
+        `SharedRateLimiter` is configured from `WQB_RATE_LIMITS`.
         """
         if logger is None:
             logger = logging.getLogger(__name__)
 
         # Create the ApiClient that handles the direct login logic
         api_client = ApiClient()
+        if 'rate_limiter' not in kwargs:
+            kwargs['rate_limiter'] = SharedRateLimiter.from_env()
 
         # Initialize the AutoAuthSession with the ApiClient
         super().__init__(
@@ -205,6 +334,9 @@ class WQBSession(AutoAuthSession):
         self.expected_location = (
             lambda resp: self.expected(resp) and LOCATION in resp.headers
         )
+        if response_cache is None:
+            response_cache = ResponseCache.from_env()
+        self.response_cache = response_cache
 
     def __repr__(
         self,
@@ -245,6 +377,17 @@ class WQBSession(AutoAuthSession):
             wqb_auth = HTTPBasicAuth(*wqb_auth)
         self.kwargs['auth'] = wqb_auth
 
+    def _cached_get(
+        self,
+        endpoint: str,
+        url: str,
+        *args,
+        **kwargs,
+    ) -> Response:
+        if self.response_cache is None or args or kwargs.get('stream'):
+            return self.get(url, *args, **kwargs)
+        return self.response_cache.get(self, endpoint, url, **kwargs)
+
     def get_authentication(
         self,
         *args,
@@ -452,7 +595,7 @@ class WQBSession(AutoAuthSession):
         True
         """
         url = URL_OPERATORS
-        resp = self.get(url, *args, **kwargs)
+        resp = self._cached_get('operators', url, *args, **kwargs)
         if log is not None:
             self.logger.info(
                 '\n'.join(
@@ -500,7 +643,7 @@ class WQBSession(AutoAuthSession):
         True
         """
         url = URL_DATASETS_DATASETID.format(dataset_id)
-        resp = self.get(url, *args, **kwargs)
+        resp = self._cached_get('datasets', url, *args, **kwargs)
         if log is not None:
             self.logger.info(
                 '\n'.join(
@@ -535,7 +678,7 @@ class WQBSession(AutoAuthSession):
         **kwargs,
     ) -> Response:
         limit = min(max(limit, 1), 50)
-        offset = min(max(offset, 0), 10000 - limit)
+        offset = min(max(offset, 0), OFFSET_CAP - limit)
         params = [
             f"region={region}",
             f"delay={delay}",
@@ -563,7 +706,7 @@ class WQBSession(AutoAuthSession):
         if others is not None:
             params.extend(others)
         url = URL_DATASETS + '?' + '&'.join(params)
-        resp = self.get(url, *args, **kwargs)
+        resp = self._cached_get('datasets', url, *args, **kwargs)
         if log is not None:
             self.logger.info(
                 '\n'.join(
@@ -576,32 +719,33 @@ class WQBSession(AutoAuthSession):
             )
         return resp
 
-    def search_datasets(
+    def _paginate(
         self,
-        region: Region,
-        delay: Delay,
-        universe: Universe,
+        name: str,
+        fetch: Callable[..., Response],
         *args,
-        limit: int = 50,
-        offset: int = 0,
-        log: str | None = '',
-        log_gap: int = 100,
+        limit: int,
+        offset: int,
+        concurrency: int,
+        ordered: bool,
+        log: str | None,
+        log_gap: int,
         **kwargs,
     ) -> Generator[Response, None, None]:
         if log is None:
             log_gap = 0
-        count = self.search_datasets_limited(
-            region, delay, universe, *args, limit=1, offset=offset, log=log, **kwargs
-        ).json()['count']
+        first = fetch(*args, limit=limit, offset=offset, log=log, **kwargs)
+        count = first.json()['count']
         offsets = range(offset, count, limit)
         if log is not None:
-            self.logger.info(f"{self}.search_datasets(...) [start {offsets}]: {log}")
+            self.logger.info(f"{self}.{name}(...) [start {offsets}]: {log}")
         total = len(offsets)
-        for idx, offset in enumerate(offsets, start=1):
-            yield self.search_datasets_limited(
-                region,
-                delay,
-                universe,
+
+        def page(
+            idx: int,
+            offset: int,
+        ) -> Response:
+            return fetch(
                 *args,
                 limit=limit,
                 offset=offset,
@@ -612,8 +756,93 @@ class WQBSession(AutoAuthSession):
                 ),
                 **kwargs,
             )
+
+        if 0 < total:
+            yield first
+        del first
+        yield from _bounded_map(
+            page,
+            enumerate(offsets[1:], start=2),
+            concurrency,
+            ordered=ordered,
+        )
         if log is not None:
-            self.logger.info(f"{self}.search_datasets(...) [finish {offsets}]: {log}")
+            self.logger.info(f"{self}.{name}(...) [finish {offsets}]: {log}")
+
+    @staticmethod
+    def _iter_records(
+        pages: Iterable[Response],
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yields the `results` of each page one by one. A page's response
+        is released as soon as it is decoded, and each record is dropped
+        from the page once yielded, so at most one decoded page is held
+        while the next one is fetched.
+        """
+        for resp in pages:
+            records = resp.json()['results']
+            resp.close()
+            del resp
+            records.reverse()
+            while records:
+                yield records.pop()
+
+    def search_datasets(
+        self,
+        region: Region,
+        delay: Delay,
+        universe: Universe,
+        *args,
+        limit: int = 50,
+        offset: int = 0,
+        concurrency: int = 1,
+        ordered: bool = True,
+        log: str | None = '',
+        log_gap: int = 100,
+        **kwargs,
+    ) -> Generator[Response, None, None]:
+        """
+        Yields every page of `search_datasets_limited`.
+
+        The total count is read from the first page. With `concurrency`
+        above 1, the remaining pages are fetched by that many threads;
+        they are yielded in offset order if `ordered`, else as they
+        complete.
+        """
+        yield from self._paginate(
+            'search_datasets',
+            self.search_datasets_limited,
+            region,
+            delay,
+            universe,
+            *args,
+            limit=limit,
+            offset=offset,
+            concurrency=concurrency,
+            ordered=ordered,
+            log=log,
+            log_gap=log_gap,
+            **kwargs,
+        )
+
+    def iter_datasets(
+        self,
+        region: Region,
+        delay: Delay,
+        universe: Universe,
+        *args,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yields the datasets of `search_datasets` one record at a time.
+
+        Notes
+        -----
+        `args` and `kwargs` are passed to `search_datasets`.
+        """
+        yield from self._iter_records(
+            self.search_datasets(region, delay, universe, *args, **kwargs)
+        )
 
     def locate_field(
         self,
@@ -623,7 +852,7 @@ class WQBSession(AutoAuthSession):
         **kwargs,
     ) -> Response:
         url = URL_DATAFIELDS_FIELDID.format(field_id)
-        resp = self.get(url, *args, **kwargs)
+        resp = self._cached_get('fields', url, *args, **kwargs)
         if log is not None:
             self.logger.info(
                 '\n'.join(
@@ -659,7 +888,7 @@ class WQBSession(AutoAuthSession):
         **kwargs,
     ) -> Response:
         limit = min(max(limit, 1), 50)
-        offset = min(max(offset, 0), 10000 - limit)
+        offset = min(max(offset, 0), OFFSET_CAP - limit)
         params = [
             f"region={region}",
             f"delay={delay}",
@@ -689,7 +918,7 @@ class WQBSession(AutoAuthSession):
         if others is not None:
             params.extend(others)
         url = URL_DATAFIELDS + '?' + '&'.join(params)
-        resp = self.get(url, *args, **kwargs)
+        resp = self._cached_get('fields', url, *args, **kwargs)
         if log is not None:
             self.logger.info(
                 '\n'.join(
@@ -710,36 +939,54 @@ class WQBSession(AutoAuthSession):
         *args,
         limit: int = 50,
         offset: int = 0,
+        concurrency: int = 1,
+        ordered: bool = True,
         log: str | None = '',
         log_gap: int = 100,
         **kwargs,
     ) -> Generator[Response, None, None]:
-        if log is None:
-            log_gap = 0
-        count = self.search_fields_limited(
-            region, delay, universe, *args, limit=1, offset=offset, log=log, **kwargs
-        ).json()['count']
-        offsets = range(offset, count, limit)
-        if log is not None:
-            self.logger.info(f"{self}.search_fields(...) [start {offsets}]: {log}")
-        total = len(offsets)
-        for idx, offset in enumerate(offsets, start=1):
-            yield self.search_fields_limited(
-                region,
-                delay,
-                universe,
-                *args,
-                limit=limit,
-                offset=offset,
-                log=(
-                    f"{idx}/{total} = {int(100*idx/total)}%"
-                    if 0 != log_gap and 0 == idx % log_gap
-                    else None
-                ),
-                **kwargs,
-            )
-        if log is not None:
-            self.logger.info(f"{self}.search_fields(...) [finish {offsets}]: {log}")
+        """
+        Yields every page of `search_fields_limited`.
+
+        The total count is read from the first page. With `concurrency`
+        above 1, the remaining pages are fetched by that many threads;
+        they are yielded in offset order if `ordered`, else as they
+        complete.
+        """
+        yield from self._paginate(
+            'search_fields',
+            self.search_fields_limited,
+            region,
+            delay,
+            universe,
+            *args,
+            limit=limit,
+            offset=offset,
+            concurrency=concurrency,
+            ordered=ordered,
+            log=log,
+            log_gap=log_gap,
+            **kwargs,
+        )
+
+    def iter_fields(
+        self,
+        region: Region,
+        delay: Delay,
+        universe: Universe,
+        *args,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yields the fields of `search_fields` one record at a time.
+
+        Notes
+        -----
+        `args` and `kwargs` are passed to `search_fields`.
+        """
+        yield from self._iter_records(
+            self.search_fields(region, delay, universe, *args, **kwargs)
+        )
 
     def locate_alpha(
         self,
@@ -815,7 +1062,7 @@ class WQBSession(AutoAuthSession):
         **kwargs,
     ) -> Response:
         limit = min(max(limit, 1), 100)
-        offset = min(max(offset, 0), 10000 - limit)
+        offset = min(max(offset, 0), OFFSET_CAP - limit)
         params = []
         if name is not None:
             params.append(f"name{name if name[0] in '~=' else '~' + name}")
@@ -927,33 +1174,182 @@ class WQBSession(AutoAuthSession):
         *args,
         limit: int = 100,
         offset: int = 0,
+        concurrency: int = 1,
+        ordered: bool = True,
         log: str | None = '',
         log_gap: int = 100,
         **kwargs,
     ) -> Generator[Response, None, None]:
-        if log is None:
-            log_gap = 0
-        count = self.filter_alphas_limited(
-            *args, limit=1, offset=offset, log=log, **kwargs
-        ).json()['count']
-        offsets = range(offset, count, limit)
+        """
+        Yields every page of `filter_alphas_limited`.
+
+        The total count is read from the first page. With `concurrency`
+        above 1, the remaining pages are fetched by that many threads;
+        they are yielded in offset order if `ordered`, else as they
+        complete.
+        """
+        yield from self._paginate(
+            'filter_alphas',
+            self.filter_alphas_limited,
+            *args,
+            limit=limit,
+            offset=offset,
+            concurrency=concurrency,
+            ordered=ordered,
+            log=log,
+            log_gap=log_gap,
+            **kwargs,
+        )
+
+    def iter_alphas(
+        self,
+        *args,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yields the alphas of `filter_alphas` one record at a time.
+
+        Notes
+        -----
+        `args` and `kwargs` are passed to `filter_alphas`.
+        """
+        yield from self._iter_records(self.filter_alphas(*args, **kwargs))
+
+    def _date_created_bound(
+        self,
+        order: str,
+        *args,
+        **kwargs,
+    ) -> datetime.datetime | None:
+        results = self.filter_alphas_limited(
+            *args, order=order, limit=1, offset=0, log=None, **kwargs
+        ).json()['results']
+        if not results:
+            return None
+        return datetime.datetime.fromisoformat(results[0]['dateCreated'])
+
+    def _date_created_shards(
+        self,
+        date_created: FilterRange,
+        *args,
+        concurrency: int,
+        **kwargs,
+    ) -> list[tuple[FilterRange, int]]:
+        def count(
+            shard: FilterRange,
+        ) -> tuple[FilterRange, int]:
+            resp = self.filter_alphas_limited(
+                *args, date_created=shard, limit=1, offset=0, log=None, **kwargs
+            )
+            return shard, resp.json()['count']
+
+        shards = []
+        pending = [date_created]
+        while pending:
+            splits = []
+            for shard, total in _bounded_map(count, ((shard,) for shard in pending), concurrency):
+                if 0 == total:
+                    continue
+                mid = (shard.lo + (shard.hi - shard.lo) / 2).replace(microsecond=0)
+                if total <= OFFSET_CAP or not shard.lo < mid < shard.hi:
+                    if OFFSET_CAP < total:
+                        self.logger.warning(
+                            f"{self}.filter_alphas_sharded(...) [{shard.to_str()} cannot be split, {total} alphas]"
+                        )
+                    shards.append((shard, total))
+                    continue
+                splits.append(FilterRange(shard.lo, mid, shard.lo_eq, False))
+                splits.append(FilterRange(mid, shard.hi, True, shard.hi_eq))
+            pending = splits
+        shards.sort(key=lambda item: item[0].lo)
+        return shards
+
+    def filter_alphas_sharded(
+        self,
+        *args,
+        date_created: FilterRange | None = None,
+        order: AlphasOrder | None = None,
+        limit: int = 100,
+        concurrency: int = 4,
+        log: str | None = '',
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Yields every alpha matching the `filter_alphas_limited` filters,
+        beyond the `OFFSET_CAP` that limits `filter_alphas`.
+
+        The `date_created` range is split in halves until each shard counts
+        at most `OFFSET_CAP` alphas. The pages of all shards are fetched
+        by `concurrency` threads, and alphas are yielded once each, by
+        shard in `date_created` order.
+
+        Parameters
+        ----------
+        date_created: FilterRange | None = None
+            The `datetime` range of `dateCreated` to export. If *None*,
+            it spans from the oldest to the newest matching alpha.
+        order: AlphasOrder | None = None
+            The order of alphas within each shard.
+        limit: int = 100
+            The page size.
+        concurrency: int = 4
+            The number of threads counting shards and fetching pages.
+        log: str | None = ''
+            The message to be appended. If *None*, logging is disabled.
+
+        Returns
+        -------
+        Generator[dict[str, Any], None, None]
+            The alpha records.
+
+        Notes
+        -----
+        `args` and `kwargs` are passed to `filter_alphas_limited`.
+        """
+        limit = min(max(limit, 1), 100)
+        if date_created is None:
+            lo = self._date_created_bound('dateCreated', *args, **kwargs)
+            hi = self._date_created_bound('-dateCreated', *args, **kwargs)
+            if lo is None or hi is None:
+                return
+            date_created = FilterRange(lo, hi, True, True)
+        shards = self._date_created_shards(
+            date_created, *args, concurrency=concurrency, **kwargs
+        )
         if log is not None:
-            self.logger.info(f"{self}.filter_alphas(...) [start {offsets}]: {log}")
-        total = len(offsets)
-        for idx, offset in enumerate(offsets, start=1):
-            yield self.filter_alphas_limited(
+            self.logger.info(
+                f"{self}.filter_alphas_sharded(...) [start {len(shards)} shards, {sum(total for _, total in shards)} alphas]: {log}"
+            )
+
+        def page(
+            shard: FilterRange,
+            offset: int,
+        ) -> list[dict[str, Any]]:
+            return self.filter_alphas_limited(
                 *args,
+                date_created=shard,
+                order=order,
                 limit=limit,
                 offset=offset,
-                log=(
-                    f"{idx}/{total} = {int(100*idx/total)}%"
-                    if 0 != log_gap and 0 == idx % log_gap
-                    else None
-                ),
+                log=None,
                 **kwargs,
-            )
+            ).json()['results']
+
+        seen = set()
+        pages = (
+            (shard, offset)
+            for shard, total in shards
+            for offset in range(0, total, limit)
+        )
+        for results in _bounded_map(page, pages, concurrency):
+            for alpha in results:
+                if alpha['id'] not in seen:
+                    seen.add(alpha['id'])
+                    yield alpha
         if log is not None:
-            self.logger.info(f"{self}.filter_alphas(...) [finish {offsets}]: {log}")
+            self.logger.info(
+                f"{self}.filter_alphas_sharded(...) [finish {len(seen)} alphas]: {log}"
+            )
 
     def patch_properties(
         self,
@@ -1040,7 +1436,12 @@ class WQBSession(AutoAuthSession):
             on_start(locals())
 
         for tries, _ in enumerate(max_tries, start=1):
-            resp = self.request(method, url, *args, **kwargs)
+            try:
+                resp = await self.arequest(method, url, *args, **kwargs)
+            except TRANSPORT_ERRORS as e:
+                self.logger.warning(f"{self}.retry(...) [{tries} tries]: {repr(e)}. Retrying in 3 seconds...")
+                await asyncio.sleep(3)
+                continue
             if expected(resp): # Check for expected response immediately
                 successful_attempt = True
                 break # Success, exit loop
@@ -1115,16 +1516,61 @@ class WQBSession(AutoAuthSession):
         *args,
         max_tries: int | Iterable[Any] = range(600),
         on_nolocation: Callable[[dict[str, Any]], None] | None = None,
+        poller: SimulationPoller | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        cache: SimulationCache | None = None,
+        resolve_children: bool = False,
+        children_concurrency: int = 10,
         log: str | None = '',
         retry_log: str | None = None,
         **kwargs,
-    ) -> Coroutine[None, None, Response | None]:
-        resp = self.post(
+    ) -> Coroutine[None, None, Response | SimulationResult | None]:
+        """
+        Posts `target` to `URL_SIMULATIONS` and polls its location until
+        the simulation completes.
+
+        If `poller` is given, the location is polled by it instead of a
+        `retry` loop of its own. `args` and `kwargs` are passed to
+        `retry`; with a `poller`, `kwargs` are passed to
+        `SimulationPoller.watch` instead.
+
+        If `limiter` is given, it is told about every rejected submission
+        and about the accepted one.
+
+        If `cache` is given, a fresh cached result of `target` is returned
+        without posting it, and a successful result is stored in it.
+
+        If `resolve_children` is *True*, a `SimulationResult` is returned
+        instead of the response, with the child simulations of a
+        `MultiAlpha` fetched by at most `children_concurrency` requests
+        at a time.
+        """
+        if cache is not None:
+            resp = cache.lookup(target)
+            if resp is not None:
+                # the parent response, as a SimulationResult has no url
+                cached_url = resp.url
+                if resolve_children:
+                    resp = await self._resolve_children(resp, children_concurrency)
+                if log is not None:
+                    self.logger.info(
+                        '\n'.join(
+                            (
+                                f"{self}.simulate(...) [",
+                                f"    {cached_url} (cached)",
+                                f"]: {log}",
+                            )
+                        )
+                    )
+                return resp
+        resp = await self.arequest(
+            POST,
             URL_SIMULATIONS,
             json=target,
             expected=self.expected_location,
             max_tries=60,
             delay_unexpected=5.0,
+            on_throttle=None if limiter is None else limiter.on_throttle,
         )
         try:
             _url = resp.headers[LOCATION]
@@ -1148,32 +1594,25 @@ class WQBSession(AutoAuthSession):
             )
             if on_nolocation is not None:
                 on_nolocation(locals())
-            return None
-
-        def is_simulation_complete(resp: Response) -> bool:
-            if not resp.ok:
-                return False  # Continue retrying on server errors
-            try:
-                data = resp.json()
-                # Stop retrying if the simulation is in a terminal state
-                status = data.get('status', '').lower()
-                if status in ('finished', 'failed', 'error', 'complete', 'warning'):
-                    return True
-                # Also handle progress, if available
-                if 'progress' in data and data['progress'] >= 1:
-                    return True
-                # Otherwise, continue polling
-                return False
-            except ValueError:
-                # Not a JSON response, probably an error page. Stop.
-                return True
+            return SimulationResult(None) if resolve_children else None
+        if limiter is not None:
+            limiter.on_success()
 
         url = _url\
             .replace('http://', 'https://')\
             .replace(ORIGIN_API_URL, WQB_API_URL)
-        resp = await self.retry(
-            GET, url, *args, max_tries=max_tries, log=retry_log, expected=is_simulation_complete, **kwargs
-        )
+        if poller is not None:
+            resp = await poller.watch(
+                url, expected=is_simulation_complete, max_tries=max_tries, **kwargs
+            )
+        else:
+            resp = await self.retry(
+                GET, url, *args, max_tries=max_tries, log=retry_log, expected=is_simulation_complete, **kwargs
+            )
+        if cache is not None and resp is not None:
+            cache.put(target, resp)
+        if resolve_children:
+            resp = await self._resolve_children(resp, children_concurrency)
         if log is not None:
             self.logger.info(
                 '\n'.join(
@@ -1186,47 +1625,101 @@ class WQBSession(AutoAuthSession):
             )
         return resp
 
+    async def _resolve_children(
+        self,
+        resp: Response | None,
+        concurrency: int,
+    ) -> SimulationResult:
+        try:
+            children = resp.json().get('children') or []
+        except (AttributeError, ValueError):
+            children = []
+        results = await concurrent_await(
+            (
+                self.retry(
+                    GET, f"{URL_SIMULATIONS}/{child}", max_tries=5, delay_key_error=1.0, log=None
+                )
+                for child in children
+            ),
+            concurrency=concurrency,
+            return_exceptions=True,
+        )
+        for idx, result in enumerate(results):
+            if isinstance(result, BaseException):
+                self.logger.warning(
+                    f"{self}._resolve_children(...) [{children[idx]}]: {repr(result)}"
+                )
+                results[idx] = None
+        return SimulationResult(resp, results)
+
     async def concurrent_simulate(
         self,
         targets: Iterable[Alpha | MultiAlpha],
-        concurrency: int | asyncio.Semaphore,
+        concurrency: int | asyncio.Semaphore | AdaptiveLimiter,
         *args,
         return_exceptions: bool = False,
+        poller: SimulationPoller | None = None,
+        poll_qps: float | None = None,
         log: str | None = '',
         log_gap: int = 100,
         **kwargs,
-    ) -> Coroutine[None, None, list[Response | BaseException]]:
+    ) -> Coroutine[None, None, list[Response | SimulationResult | BaseException]]:
+        """
+        Simulates `targets` with at most `concurrency` simulations in
+        flight. If `concurrency` is an `AdaptiveLimiter`, it is passed to
+        each `simulate` as `limiter`, so the number of simulations in
+        flight follows the account's available slots.
+
+        If `poller` is given, all locations are polled by it. Otherwise,
+        if `poll_qps` is given, a `SimulationPoller` capped at `poll_qps`
+        polls per second is created for this call and closed afterwards.
+
+        A `cache` keyword is passed to each `simulate`, so targets with a
+        cached result are not simulated again, and so is
+        `resolve_children`, so that children are fetched while other
+        simulations are still running.
+        """
         if not isinstance(targets, Sized):
             targets = list(targets)
         if log is None:
             log_gap = 0
         if isinstance(concurrency, int):
             concurrency = asyncio.Semaphore(value=concurrency)
+        if isinstance(concurrency, AdaptiveLimiter):
+            kwargs['limiter'] = concurrency
+        own_poller = poller is None and poll_qps is not None
+        if own_poller:
+            poller = SimulationPoller(self, max_qps=poll_qps)
         total = len(targets)
         if log is not None:
             self.logger.info(
-                f"{self}.concurrent_simulate(...) [start {total}, {concurrency._value}]: {log}"
+                f"{self}.concurrent_simulate(...) [start {total}, {_concurrency_value(concurrency)}]: {log}"
             )
-        resp = await concurrent_await(
-            (
-                self.simulate(
-                    target,
-                    *args,
-                    log=(
-                        f"{idx}/{total} = {int(100*idx/total)}%"
-                        if 0 != log_gap and 0 == idx % log_gap
-                        else None
-                    ),
-                    **kwargs,
-                )
-                for idx, target in enumerate(targets, start=1)
-            ),
-            concurrency=concurrency,
-            return_exceptions=return_exceptions,
-        )
+        try:
+            resp = await concurrent_await(
+                (
+                    self.simulate(
+                        target,
+                        *args,
+                        poller=poller,
+                        log=(
+                            f"{idx}/{total} = {int(100*idx/total)}%"
+                            if 0 != log_gap and 0 == idx % log_gap
+                            else None
+                        ),
+                        **kwargs,
+                    )
+                    for idx, target in enumerate(targets, start=1)
+                ),
+                concurrency=concurrency,
+                return_exceptions=return_exceptions,
+            )
+        finally:
+            if own_poller:
+                await poller.close()
         if log is not None:
             self.logger.info(
-                f"{self}.concurrent_simulate(...) [finish {total}, {concurrency._value}]: {log}"
+                f"{self}.concurrent_simulate(...) [finish {total}, {_concurrency_value(concurrency)}]: {log}"
             )
         return resp
 
@@ -1258,7 +1751,7 @@ class WQBSession(AutoAuthSession):
     async def concurrent_check(
         self,
         alpha_ids: Iterable[str],
-        concurrency: int | asyncio.Semaphore,
+        concurrency: int | asyncio.Semaphore | AdaptiveLimiter,
         *args,
         return_exceptions: bool = False,
         log: str | None = '',
@@ -1274,7 +1767,7 @@ class WQBSession(AutoAuthSession):
         total = len(alpha_ids)
         if log is not None:
             self.logger.info(
-                f"{self}.concurrent_check(...) [start {total}, {concurrency._value}]: {log}"
+                f"{self}.concurrent_check(...) [start {total}, {_concurrency_value(concurrency)}]: {log}"
             )
         resp = await concurrent_await(
             (
@@ -1295,7 +1788,7 @@ class WQBSession(AutoAuthSession):
         )
         if log is not None:
             self.logger.info(
-                f"{self}.concurrent_check(...) [finish {total}, {concurrency._value}]: {log}"
+                f"{self}.concurrent_check(...) [finish {total}, {_concurrency_value(concurrency)}]: {log}"
             )
         return resp
 